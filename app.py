@@ -1,26 +1,26 @@
+import importlib
 import streamlit as st
-from utils.io import load_data
-from utils.viz import line_chart, bar_chart
-from sections import intro, data_cleaning, overview, deep_dives, country_cluster, conclusions
-from utils.prep import preprocess_data
-from utils.prep import make_tables
+from utils.artifacts import get_raw_data, get_clean_data, get_filter_index, get_tables, view_key
+from utils.filters import resolve_filters, apply_filters, sidebar_filters, normalize_selection
+from utils.warmup import start_warmup
+from utils.watcher import start_watcher, refresh_notice
 st.set_page_config(page_title="Car Sales Dashboard", layout="wide")
 
-@st.cache_data
-def get_raw_data():
+def load_section(name):
     """
-    Load raw dataset 
+    Import a page module on first visit / 首次访问时才导入页面模块
+    Keeps heavy plotting backends out of the startup path.
     """
-    df = load_data()
-    return df
-def get_clean_data():
-    df_raw = load_data()
-    df_clean = preprocess_data(df_raw)
-    return df_clean
+    return importlib.import_module(f"sections.{name}")
 
-df_clean = get_clean_data()
+# 数据版本（后台监控）+ 后台预热 / Data version from the watcher and background warm-up
+watcher_status = start_watcher()
+version = watcher_status["version"]
+warmup_status = start_warmup(version)
 
-df_raw = get_raw_data()
+df_clean = get_clean_data(version)
+
+df_raw = get_raw_data(version)
 
 # Sidebar logos
 st.sidebar.image("assets/EFREI-logo.png", use_container_width=True)
@@ -47,26 +47,42 @@ page = st.sidebar.radio(
     ["Intro", "Data Cleaning", "Overview", "Deep Dives", "Country Cluster", "conclusions"]  # 新增 Country Cluster
 )
 
+# Global filters / 全局筛选
+filter_index = get_filter_index(view_key(version), df_clean)
+selection = sidebar_filters(filter_index)
+positions = resolve_filters(filter_index, selection)
+df_view = apply_filters(df_clean, positions)
+view = view_key(version, normalize_selection(filter_index, selection), positions)
+st.sidebar.caption(f"{len(df_view):,} of {len(df_clean):,} rows selected")
+if warmup_status["current"]:
+    st.sidebar.caption(f"Warming cache: {warmup_status['current']}…")
+with st.sidebar:
+    refresh_notice(watcher_status, version)
+
+if df_view.empty and not page.startswith(("Intro", "Data Cleaning", "conclusions")):
+    st.warning("No rows match the current filters")
+    st.stop()
+
 # Page display / 页面显示
 if page.startswith("Intro"):
-    intro.show()
+    load_section("intro").show()
 elif page.startswith("Data Cleaning"):
-    df_clean = data_cleaning.show(df_raw)
+    df_clean = load_section("data_cleaning").show(df_raw, df_clean, version)
 elif page.startswith("Overview"):
     if 'df_clean' not in locals():
         st.warning("Please clean the data first")
     else:
-        tables = make_tables(df_clean)
-        overview.show(df_clean, tables)
+        tables = get_tables(view, df_view)
+        load_section("overview").show(df_view, tables, view)
 elif page.startswith("Deep Dives"):
     if 'df_clean' not in locals():
         st.warning("Please clean the data first")
     else:
-        deep_dives.show(df_clean)
+        load_section("deep_dives").show(df_view, view)
 elif page.startswith("Country Cluster"): 
     if 'df_clean' not in locals():
         st.warning("Please clean the data first")
     else:
-        country_cluster.show(df_clean)
+        load_section("country_cluster").show(df_view, view)
 elif page.startswith("conclusions"):
-    conclusions.show()
\ No newline at end of file
+    load_section("conclusions").show()
\ No newline at end of file
@@ -0,0 +1,86 @@
+"""
+Import-time benchmark / 启动导入耗时基准
+
+Imports each dashboard module in a fresh interpreter and reports its import
+cost, plus which heavy plotting libraries were pulled in. Run from the repository root:
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --repeat 5 --budget-ms 1500
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 被测模块 / Modules on the startup and page paths
+TARGETS = [
+    "utils.io",
+    "utils.prep",
+    "utils.filters",
+    "utils.artifacts",
+    "utils.warmup",
+    "utils.viz",
+    "utils.viz.altair_charts",
+    "utils.viz.plotly_charts",
+    "utils.viz.mpl_charts",
+    "sections.intro",
+    "sections.data_cleaning",
+    "sections.overview",
+    "sections.deep_dives",
+    "sections.country_cluster",
+    "sections.conclusions",
+]
+HEAVY_MODULES = ["matplotlib", "seaborn", "scipy"]
+
+
+def measure(target):
+    """
+    Import time (ms) of one module in a fresh interpreter / 单次测量
+    Returns (milliseconds, heavy modules loaded).
+    """
+    probe = (
+        "import sys, json, time, importlib\n"
+        "start = time.perf_counter()\n"
+        f"importlib.import_module({target!r})\n"
+        "elapsed = (time.perf_counter() - start) * 1000\n"
+        f"print(json.dumps([elapsed, [m for m in {HEAVY_MODULES!r} if m in sys.modules]]))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    elapsed, heavy = json.loads(result.stdout.strip().splitlines()[-1])
+    return elapsed, heavy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per module, the median is reported")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="fail if any startup-path module (not the cluster page) exceeds this")
+    parser.add_argument("targets", nargs="*", default=TARGETS)
+    args = parser.parse_args()
+
+    print(f"{'module':32} {'median ms':>10}  heavy imports")
+    over_budget = []
+    for target in args.targets:
+        runs = [measure(target) for _ in range(args.repeat)]
+        median_ms = statistics.median(ms for ms, _ in runs)
+        heavy = runs[-1][1]
+        print(f"{target:32} {median_ms:10.1f}  {', '.join(heavy) or '-'}")
+        startup_path = target not in ("utils.viz.mpl_charts", "sections.country_cluster")
+        if args.budget_ms is not None and startup_path and median_ms > args.budget_ms:
+            over_budget.append(target)
+
+    if over_budget:
+        print(f"Over budget ({args.budget_ms} ms): {', '.join(over_budget)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
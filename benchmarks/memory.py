@@ -0,0 +1,110 @@
+"""
+Peak-memory benchmark for data and chart builders / 构建函数峰值内存基准
+
+Runs each builder on the cleaned dataset (optionally replicated) under
+tracemalloc with pandas Copy-on-Write enabled, and reports peak allocation
+as a multiple of the input frame's size. Run from the repository root:
+
+    python benchmarks/memory.py
+    python benchmarks/memory.py --scale 200 --check
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+import warnings
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+pd.set_option("mode.copy_on_write", True)
+
+from utils.io import load_data  # noqa: E402
+from utils.prep import preprocess_data, make_tables, make_treemap_hierarchy  # noqa: E402
+from utils.prep import make_retention_matrix, make_country_clusters  # noqa: E402
+from utils.customers import build_customer_table  # noqa: E402
+from utils.orders import build_order_table  # noqa: E402
+from utils.anomaly import detect_price_anomalies  # noqa: E402
+from utils.metrics import compute_period_metrics  # noqa: E402
+from utils.viz.altair_charts import scatter_price_msrp  # noqa: E402
+from utils.viz.plotly_charts import choropleth_sales, product_sales_funnel  # noqa: E402
+
+# 峰值 / 输入表大小 的上限 / Allowed peak allocation as a multiple of the input frame
+# 由实测峰值（--scale 20 与 200 中较大者）加少量余量得到 / Measured peak (max of --scale 20 and 200) plus a small margin
+BUILDERS = {
+    "preprocess_data": (lambda raw, clean: preprocess_data(raw), 0.25),
+    "build_order_table": (lambda raw, clean: build_order_table(clean), 0.12),
+    "make_tables": (lambda raw, clean: make_tables(clean, build_order_table(clean)), 0.12),
+    "make_treemap_hierarchy": (lambda raw, clean: make_treemap_hierarchy(clean), 0.15),
+    "build_customer_table": (lambda raw, clean: build_customer_table(clean, build_order_table(clean)), 0.12),
+    "make_retention_matrix": (
+        lambda raw, clean: make_retention_matrix(clean, build_customer_table(clean, build_order_table(clean))), 0.3
+    ),
+    "detect_price_anomalies": (lambda raw, clean: detect_price_anomalies(clean), 0.3),
+    "compute_period_metrics": (lambda raw, clean: compute_period_metrics(clean), 0.15),
+    "make_country_clusters": (lambda raw, clean: make_country_clusters(clean), 0.4),
+    "scatter_price_msrp": (lambda raw, clean: scatter_price_msrp(clean, "QUANTITYORDERED"), 0.05),
+    "choropleth_sales": (lambda raw, clean: choropleth_sales(clean, "2019-11"), 0.2),
+    "product_sales_funnel": (lambda raw, clean: product_sales_funnel(clean), 0.1),
+}
+
+
+def replicate(df_raw, scale):
+    """
+    Stack scale copies with distinct order numbers / 复制数据并保持订单号唯一
+    """
+    if scale <= 1:
+        return df_raw
+    step = int(df_raw["ORDERNUMBER"].max()) + 1
+    return pd.concat(
+        [df_raw.assign(ORDERNUMBER=df_raw["ORDERNUMBER"] + i * step) for i in range(scale)],
+        ignore_index=True,
+    )
+
+
+def measure(build, df_raw, df_clean):
+    """
+    Peak traced allocation (bytes) while building / 单个构建函数的峰值内存
+    """
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    try:
+        build(df_raw, df_clean)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=20, help="replicate the dataset this many times")
+    parser.add_argument("--check", action="store_true", help="fail if any builder exceeds its budget")
+    parser.add_argument("builders", nargs="*", default=list(BUILDERS))
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    df_raw = replicate(load_data(os.path.join(ROOT, "data", "Auto Sales data.csv")), args.scale)
+    df_clean = preprocess_data(df_raw)
+    input_bytes = df_clean.memory_usage(deep=True).sum()
+    print(f"{len(df_clean):,} rows, clean frame {input_bytes / 2**20:.1f} MB\n")
+
+    print(f"{'builder':26} {'peak MB':>9} {'x input':>8} {'budget':>7}")
+    over_budget = []
+    for name in args.builders:
+        build, budget = BUILDERS[name]
+        peak = measure(build, df_raw, df_clean)
+        ratio = peak / input_bytes
+        print(f"{name:26} {peak / 2**20:9.1f} {ratio:8.2f} {budget:7.2f}")
+        if args.check and ratio > budget:
+            over_budget.append(name)
+
+    if over_budget:
+        print(f"Over budget: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,10 +2,12 @@
 import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
-from scipy.cluster.hierarchy import fcluster, dendrogram
 from utils.viz import cluster_dendrogram, cluster_heatmap, cluster_radar_chart, cluster_distribution_pie
+from utils.artifacts import get_country_clusters
+from utils.export import export_widget
+from utils.table_view import table_viewer, column_formats
 
-def show(df_clean):
+def show(df_clean, view_key):
     """
     Country Clustering based on Product Line Sales Share
     """
@@ -24,28 +26,33 @@ def show(df_clean):
     # -------------------------
     st.subheader("DATA PREPARATION")
     
-    # Calculate sales share by product line for each country
-    df_features = df_clean.groupby(["COUNTRY", "PRODUCTLINE"])["SALES"].sum().unstack(fill_value=0)
-    df_features_pct = df_features.div(df_features.sum(axis=1), axis=0)  # Convert to percentages
+    # Calculate sales share by product line for each country (cached with the clustering)
+    country_clusters = get_country_clusters(view_key, df_clean)
+    df_features = country_clusters["features"]
+    df_features_pct = country_clusters["features_pct"]
     
     st.info(f"DATASET OVERVIEW: {df_features_pct.shape[0]} countries × {df_features_pct.shape[1]} product lines")
+
+    # 需要能分出 4 个不同的簇 / Clustering needs countries that form 4 distinct clusters
+    if country_clusters["linkage"] is None:
+        st.warning("The current filters leave too few countries with distinct product-line mixes for 4 clusters. "
+                   "Select at least 4 countries and more than one product line.")
+        return
     
     # Display raw data
     with st.expander("VIEW COUNTRY-PRODUCT MATRIX"):
-        st.dataframe(df_features_pct.style.format("{:.2%}"), use_container_width=True)
+        table_viewer(df_features_pct, key="country_product_matrix",
+                     formats={col: "percent" for col in df_features_pct.columns})
 
     # -------------------------
     # Hierarchical clustering
     # -------------------------
     st.subheader("CLUSTERING ANALYSIS")
     
-    # Fixed to 4 clusters based on analysis
-    n_clusters = 4
-    linkage_method = "ward"
-
-    # Perform hierarchical clustering and get dendrogram
-    dendro_fig, Z = cluster_dendrogram(df_features_pct, linkage_method)
-    clusters = fcluster(Z, t=n_clusters, criterion='maxclust')
+    # Fixed to 4 clusters (ward linkage) based on analysis
+    Z = country_clusters["linkage"]
+    clusters = country_clusters["clusters"]
+    dendro_fig = cluster_dendrogram(df_features_pct, Z)
     
     # Create cluster results DataFrame
     cluster_df = pd.DataFrame({
@@ -53,13 +60,13 @@ def show(df_clean):
         "cluster": clusters
     }).set_index("COUNTRY")
     
-    df_features_with_cluster = df_features_pct.copy()
-    df_features_with_cluster['cluster'] = cluster_df.loc[df_features_pct.index, 'cluster']
-    df_features_with_cluster['Total_Sales'] = df_features.sum(axis=1)
+    df_features_with_cluster = df_features_pct.assign(
+        cluster=cluster_df.loc[df_features_pct.index, 'cluster'],
+        Total_Sales=df_features.sum(axis=1),
+    )
 
     # Get dendrogram order for heatmap
-    dendro_result = dendrogram(Z, labels=df_features_pct.index, leaf_font_size=10, orientation='left', no_plot=True)
-    dendro_order = dendro_result['ivl']
+    dendro_order = country_clusters["dendro_order"]
 
     # -------------------------
     # Visualization Layout
@@ -170,7 +177,7 @@ def show(df_clean):
         
         with col2:
             st.metric("TOTAL CLUSTER SALES", f"${cluster_sales[1]:,.0f}")
-            st.metric("MARKET COVERAGE", f"{len(cluster_countries[1])}/19 Countries")
+            st.metric("MARKET COVERAGE", f"{len(cluster_countries[1])}/{len(df_features_pct)} Countries")
             st.metric("STRATEGIC IMPORTANCE", "Core Markets")
         
         st.markdown("""
@@ -203,7 +210,7 @@ def show(df_clean):
         
         with col2:
             st.metric("TOTAL CLUSTER SALES", f"${cluster_sales[3]:,.0f}")
-            st.metric("MARKET COVERAGE", f"{len(cluster_countries[3])}/19 Countries")
+            st.metric("MARKET COVERAGE", f"{len(cluster_countries[3])}/{len(df_features_pct)} Countries")
             st.metric("MARKET TYPE", "Balanced Development")
         
         st.markdown("""
@@ -295,7 +302,7 @@ def show(df_clean):
         
         performance_data = {
             'CLUSTER': ['Cluster 1', 'Cluster 3', 'Belgium', 'Switzerland'],
-            'COUNTRIES': [len(cluster_countries[1]), len(cluster_countries[3]), 1, 1],
+            'COUNTRIES': [len(cluster_countries[1]), len(cluster_countries[3]), len(cluster_countries[2]), len(cluster_countries[4])],
             'TOTAL SALES': [f"${cluster_sales[1]:,.0f}", f"${cluster_sales[3]:,.0f}", f"${cluster_sales[2]:,.0f}", f"${cluster_sales[4]:,.0f}"],
             'MARKET SHARE': [f"{(cluster_sales[1]/total_sales_all):.1%}", f"{(cluster_sales[3]/total_sales_all):.1%}", 
                            f"{(cluster_sales[2]/total_sales_all):.1%}", f"{(cluster_sales[4]/total_sales_all):.1%}"],
@@ -311,22 +318,17 @@ def show(df_clean):
     st.subheader("DATA EXPORT")
     
     # Create detailed results table
-    result_df = df_features_with_cluster.copy()
-    result_df['Cluster_Size'] = result_df['cluster'].map(cluster_df['cluster'].value_counts())
+    result_df = df_features_with_cluster.assign(
+        Cluster_Size=df_features_with_cluster['cluster'].map(cluster_df['cluster'].value_counts())
+    )
     
     with st.expander("VIEW DETAILED CLUSTER ASSIGNMENT"):
         display_df = result_df.reset_index()[['COUNTRY', 'cluster', 'Total_Sales', 'Cluster_Size']]
-        display_df['Total_Sales'] = display_df['Total_Sales'].map("${:,.0f}".format)
-        st.dataframe(display_df.sort_values('cluster'), use_container_width=True)
+        st.dataframe(display_df.sort_values('cluster'), use_container_width=True,
+                     column_config=column_formats(display_df, {'Total_Sales': "dollar"}))
     
-    # Download button
-    csv = result_df.reset_index().to_csv(index=False)
-    st.download_button(
-        label="DOWNLOAD CLUSTER RESULTS AS CSV",
-        data=csv,
-        file_name="country_cluster_analysis.csv",
-        mime="text/csv",
-    )
+    # Download button (file generated only on request)
+    export_widget({"Cluster results": result_df.reset_index()}, "country_cluster_analysis", key="country_cluster")
 
     st.markdown("---")
     st.caption("ANALYSIS INSIGHT: Market segmentation based on product preferences provides more strategic value than traditional geographic grouping.")
\ No newline at end of file
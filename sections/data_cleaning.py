@@ -1,8 +1,23 @@
 import streamlit as st
 import pandas as pd
 from utils.prep import preprocess_data
+from utils.profile import profile_frame, profile_summary
+from utils.disk_cache import disk_cached
+from utils.artifacts import get_duplicate_report
+from utils.table_view import table_viewer, column_formats
 
-def show(df_raw):
+# 分块画像的块大小 / Rows per profiled chunk
+PROFILE_CHUNK_ROWS = 100_000
+
+@st.cache_data(max_entries=2)
+@disk_cached
+def get_data_profile(version, _df_clean):
+    """
+    Sketch-based column profile, built once per data version / 每个数据版本只构建一次画像
+    """
+    return profile_summary(profile_frame(_df_clean, chunk_rows=PROFILE_CHUNK_ROWS))
+
+def show(df_raw, df_clean=None, version=None):
     """
     Dataset introduction and cleaning / 数据集介绍与清理
     """
@@ -32,7 +47,7 @@ def show(df_raw):
     st.info("""
     The main cleaning operations include:
     1. Trim whitespace from string columns
-    2. Remove duplicate rows
+    2. Remove duplicate order lines (keyed on ORDERNUMBER + ORDERLINENUMBER)
     3. Convert date columns to datetime
     4. Additional cleaning steps can be added as needed
     """)
@@ -42,9 +57,21 @@ def show(df_raw):
     # -------------------------
     # Preprocess data / 调用预处理函数
     # -------------------------
-    df_clean = preprocess_data(df_raw)
+    # 重复行报告与清洗结果同一次计算 / The duplicate report comes from the same cleaning pass
+    if df_clean is None:
+        df_clean, duplicate_report = preprocess_data(df_raw, with_report=True)
+    else:
+        duplicate_report = get_duplicate_report(version)
     st.success("Data cleaned successfully ✅")
 
+    n_exact = int((duplicate_report["DUPLICATE_TYPE"] == "exact").sum())
+    col1, col2 = st.columns(2)
+    col1.metric("Exact Duplicates Removed", n_exact)
+    col2.metric("Conflicting Same-Key Rows", len(duplicate_report) - n_exact)
+    if len(duplicate_report):
+        with st.expander("VIEW DUPLICATE REPORT"):
+            table_viewer(duplicate_report, key="duplicate_report")
+
     st.markdown("---")
 
     # -------------------------
@@ -52,15 +79,19 @@ def show(df_raw):
     # -------------------------
     st.subheader("Column-wise Summary")
 
-    # 分离数值列和分类列 / Separate numerical and categorical columns
-    num_cols = df_clean.select_dtypes(include='number').columns
-    cat_cols = df_clean.select_dtypes(exclude='number').columns
+    # 草图近似统计（HLL 去重、KLL 分位数、高频值）/ Sketch-based approximate statistics
+    num_summary, cat_summary = get_data_profile(version, df_clean)
 
     st.markdown("**Numerical Columns Summary**")
-    st.dataframe(df_clean[num_cols].describe().T.style.format("{:.2f}"), use_container_width=True)
+    number_formats = {col: "%.2f" for col in num_summary.columns}
+    number_formats["quantile rank error ±"] = "percent"
+    st.dataframe(num_summary, column_config=column_formats(num_summary, number_formats), use_container_width=True)
+    st.caption("Quartiles come from a KLL sketch; their rank error is shown per column.")
 
     st.markdown("**Categorical Columns Summary**")
-    st.dataframe(df_clean[cat_cols].describe().T, use_container_width=True)
+    st.dataframe(cat_summary, use_container_width=True)
+    st.caption("Unique counts come from HyperLogLog (± one standard error); top values from a Misra-Gries "
+               "summary, where freq may be low by at most the freq error.")
 
     st.markdown("---")
 
@@ -3,9 +3,16 @@ import pandas as pd
 import plotly.express as px
 import altair as alt
 from utils.viz import line_chart_au_fr, choropleth_sales, heatmap_sales, scatter_price_msrp
-from utils.viz import customer_retention_heatmap
+from utils.viz import customer_retention_heatmap, rfm_segment_chart, whatif_trend_chart, whatif_country_chart
+from utils.artifacts import get_retention_matrix, get_forecast_panel, get_period_metrics, get_customer_table
+from utils.artifacts import get_price_anomalies, get_price_cube
+from utils.metrics import METRIC_LABELS
+from utils.customers import segment_summary
+from utils.anomaly import anomaly_table, Z_THRESHOLD
+from utils.table_view import table_viewer
+from utils.whatif import simulate, PRICE_DIMS
 
-def show(df_clean):
+def show(df_clean, view_key):
     """
     Deep dive analysis: Australia vs France sales trend + scatter plot
     深度分析：澳大利亚与法国销售趋势 + 散点图
@@ -16,7 +23,9 @@ def show(df_clean):
     # Line chart: Australia vs France
     # -------------------------
     st.subheader("Australia vs France Sales Trend ")
-    st.altair_chart(line_chart_au_fr(df_clean), use_container_width=True)
+    df_country_metrics = get_period_metrics(view_key, df_clean, "COUNTRY")
+    st.altair_chart(line_chart_au_fr(df_country_metrics, get_forecast_panel(view_key, df_clean)), use_container_width=True)
+    st.caption("Dashed lines: 6-month Holt-Winters forecast.")
     
     # -------------------------
     # Sales Quantity Map by Month
@@ -27,14 +36,21 @@ def show(df_clean):
     st.plotly_chart(choropleth_sales(df_clean, selected_month), use_container_width=True)
     
     """
-    Display side-by-side heatmaps of sales by country and month for 2018 and 2019
-    分别显示 2018 年和 2019 年每个月各国家的销量热力图
+    Display side-by-side heatmaps of a monthly metric for every year in the data
+    按年份并排显示每个月各维度的指标热力图（年份不再写死）
     """
-    st.subheader("Sales Heatmap by Country and Month")
-    
-    heatmap_2018 = heatmap_sales(df_clean, 2018)
-    heatmap_2019 = heatmap_sales(df_clean, 2019)
-    st.altair_chart(alt.hconcat(heatmap_2018, heatmap_2019), use_container_width=True)
+    st.subheader("Sales Heatmap by Dimension and Month")
+
+    col_dim, col_metric = st.columns(2)
+    heatmap_dim = col_dim.selectbox("Heatmap dimension", ["COUNTRY", "PRODUCTLINE", "DEALSIZE"])
+    heatmap_metric = col_metric.selectbox("Heatmap metric", list(METRIC_LABELS), format_func=METRIC_LABELS.get)
+    df_metrics = df_country_metrics if heatmap_dim == "COUNTRY" else get_period_metrics(view_key, df_clean, heatmap_dim)
+
+    heatmaps = [
+        heatmap_sales(df_metrics, year, heatmap_dim, heatmap_metric, METRIC_LABELS[heatmap_metric])
+        for year in sorted(df_metrics["YEAR"].unique())
+    ]
+    st.altair_chart(alt.hconcat(*heatmaps), use_container_width=True)
     
     st.subheader("Updated Observation on Seasonal Sales Trends")
     st.markdown("""
@@ -53,7 +69,10 @@ def show(df_clean):
     
     options = ["QUANTITYORDERED", "SALES", "DAYS_SINCE_LASTORDER", "MSRP", "PRICEEACH", "ORDERDATE"]
     x_axis = st.selectbox("Select X-axis", options)
-    st.altair_chart(scatter_price_msrp(df_clean, x_axis), use_container_width=True)
+    df_scores = get_price_anomalies(view_key, df_clean)
+    # 阈值滑块在下方，先从 session_state 读取使红圈与表格一致 / Slider is below; read it first so rings match the table
+    threshold = st.session_state.get("anomaly_threshold", Z_THRESHOLD)
+    st.altair_chart(scatter_price_msrp(df_clean, x_axis, df_scores, threshold), use_container_width=True)
     
     st.subheader("Price vs MSRP Analysis Insight")
     st.markdown("""
@@ -63,21 +82,91 @@ def show(df_clean):
     - Future Deep Dive analysis could explore pricing strategies, discounts, and market dynamics influencing these variations.
     """)
 
+    # -------------------------
+    # Price Anomalies
+    # -------------------------
+    st.subheader("Price Anomalies")
+    threshold = st.slider("Robust z-score threshold", 2.0, 10.0, Z_THRESHOLD, 0.5, key="anomaly_threshold")
+    df_anomalies = anomaly_table(df_clean, df_scores, threshold)
+    st.caption(f"{len(df_anomalies):,} of {len(df_clean):,} order lines flagged")
+    table_viewer(df_anomalies, key="price_anomalies",
+                 formats={"PRICE_DIFF_RATIO": "percent", "GROUP_MEDIAN": "percent", "ROBUST_Z": "%.1f"})
+    st.markdown("""
+    - Each line's price-to-MSRP ratio is compared with the median of its product code, or of its product line when the code has few lines.
+    - The robust z-score uses the median absolute deviation, so a handful of extreme prices cannot hide each other. Red rings mark flagged lines in the scatter above.
+    """)
+
+    # -------------------------
+    # What-If Pricing
+    # -------------------------
+    st.subheader("What-If Pricing")
+    whatif_panel(get_price_cube(view_key, df_clean))
+    st.markdown("""
+    - Price changes on product line, country and deal size compound; untouched members keep their current prices.
+    - With elasticity e, quantity scales by (1 + change)^e, so e = 0 keeps volumes fixed and e < 0 lets demand fall as prices rise.
+    """)
+
     # -------------------------
     # NEW: Customer Retention Analysis
     # -------------------------
     st.subheader("Customer Retention Analysis")
-    st.plotly_chart(customer_retention_heatmap(df_clean), use_container_width=True)
+    st.plotly_chart(customer_retention_heatmap(get_retention_matrix(view_key, df_clean)), use_container_width=True)
     st.markdown("""
     - Analyze customer retention patterns over time.
     - Cohorts show how well customers are retained after their first purchase.
     - Darker blue indicates higher retention rates.
     """)
 
+    # -------------------------
+    # Customer Segmentation (RFM)
+    # -------------------------
+    st.subheader("Customer Segmentation (RFM)")
+    df_customers = get_customer_table(view_key, df_clean)
+    st.plotly_chart(rfm_segment_chart(segment_summary(df_customers)), use_container_width=True)
+    segment = st.selectbox("Segment", ["All"] + sorted(df_customers["SEGMENT"].unique()), key="rfm_segment")
+    df_segment = df_customers if segment == "All" else df_customers[df_customers["SEGMENT"] == segment]
+    table_viewer(
+        df_segment.sort_values("REVENUE", ascending=False)[
+            ["COUNTRY", "SEGMENT", "RFM_SCORE", "ORDERS", "REVENUE", "AVG_ORDER_VALUE", "RECENCY_DAYS", "COHORT"]
+        ].assign(COHORT=lambda d: d["COHORT"].astype(str)),
+        key="rfm_customers",
+        formats={"REVENUE": "dollar", "AVG_ORDER_VALUE": "dollar"},
+    )
+    st.markdown("""
+    - Recency, frequency and monetary value are scored 1-5 by quintile across customers in the current view.
+    - Recency is measured in days from each customer's last order to the latest order date in the data.
+    """)
+
     st.markdown("---")
     st.info(
     """
     For further insights on how countries group together based on product line sales share,
     please check the **Country Clusters** page in the sidebar.  
     """
-    )
\ No newline at end of file
+    )
+
+
+@st.fragment
+def whatif_panel(cube):
+    """
+    Pricing scenario controls and results; reruns on its own / 价格情景面板（局部重跑）
+    """
+    changes = {}
+    for col, dim in zip(st.columns(len(PRICE_DIMS)), PRICE_DIMS):
+        members = col.multiselect(dim.title(), cube["dims"][dim]["labels"].tolist(), key=f"whatif_{dim}")
+        pct = col.slider(f"{dim.title()} price change (%)", -30, 30, 0, 1, key=f"whatif_{dim}_pct")
+        changes[dim] = {member: pct / 100 for member in members}
+    elasticity = st.slider("Price elasticity of demand", -3.0, 0.0, 0.0, 0.1, key="whatif_elasticity")
+
+    result = simulate(cube, changes, elasticity)
+    kpi = result["kpi"]
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Scenario Sales", f"${kpi['scenario_sales']:,.0f}", f"{kpi['sales_change_pct']:+.2%}")
+    c2.metric("Scenario Quantity", f"{kpi['scenario_quantity']:,.0f}",
+              f"{kpi['scenario_quantity'] - kpi['base_quantity']:+,.0f}")
+    c3.metric("Average Price Change", f"{kpi['avg_price_change_pct']:+.2%}")
+
+    col_trend, col_country = st.columns(2)
+    col_trend.altair_chart(whatif_trend_chart(result["monthly"]), use_container_width=True)
+    col_country.altair_chart(whatif_country_chart(result["by_country"]), use_container_width=True)
+
@@ -1,9 +1,16 @@
 import streamlit as st
 import pandas as pd
 from utils.viz import line_chart, bar_chart, show_all_country_pies, scatter_price
-from utils.viz import sales_treemap, correlation_heatmap, product_sales_funnel
+from utils.viz import sales_treemap, correlation_heatmap, product_sales_funnel, forecast_chart
+from utils.viz import product_affinity_heatmap
+from utils.artifacts import get_treemap_hierarchy, get_segment_stats, get_forecast_panel, get_customer_table
+from utils.artifacts import get_product_affinity, get_leaderboards
+from utils.leaderboard import top_n, LEADERBOARD_METRICS, TOP_N
+from utils.stats import correlation_matrix, SEGMENT_COLUMNS
+from utils.export import export_widget
+from utils.table_view import table_viewer
 
-def show(df_clean, tables):
+def show(df_clean, tables, view_key):
     """
     Display dashboard overview with KPIs and trends / 总览页面
     """
@@ -14,7 +21,14 @@ def show(df_clean, tables):
     c1.metric("Total Sales", f"${tables['kpi']['total_sales']:.2f}")
     c2.metric("Total Quantity", tables['kpi']['total_quantity'])
     c3.metric("Average Price", f"${tables['kpi']['avg_price']:.2f}")
-    c4.metric("Unique Customers", df_clean['CUSTOMERNAME'].nunique())
+    c4.metric("Unique Customers", len(get_customer_table(view_key, df_clean)))
+
+    # 订单级 KPI（来自订单事实表）/ Order-level KPIs from the order table
+    c5, c6, c7, c8 = st.columns(4)
+    c5.metric("Orders", f"{tables['kpi']['orders']:,}")
+    c6.metric("Average Order Value", f"${tables['kpi']['aov']:,.2f}")
+    c7.metric("Lines per Order", f"{tables['kpi']['basket_lines']:.1f}")
+    c8.metric("Units per Order", f"{tables['kpi']['basket_units']:.1f}")
 
     # Sales trends
     st.subheader("Sales Trends")
@@ -24,6 +38,14 @@ def show(df_clean, tables):
     - Sales trends for 2018 and 2019 are similar, showing seasonal stability.
     """)
 
+    # Sales forecast
+    st.subheader("Sales Forecast")
+    st.altair_chart(forecast_chart(get_forecast_panel(view_key, df_clean)), use_container_width=True)
+    st.markdown("""
+    - Next 6 months, summed from Holt-Winters forecasts fitted to every country × product line series.
+    - Smoothing parameters are picked per series from a small grid by in-sample error.
+    """)
+
     # Sales by country
     st.subheader("Sales by Country")
     bar_chart(tables["by_region"])
@@ -34,9 +56,13 @@ def show(df_clean, tables):
 
     # NEW: Sales Treemap
     st.subheader("Sales Hierarchy Treemap")
-    st.plotly_chart(sales_treemap(df_clean), use_container_width=True)
+    hierarchy = get_treemap_hierarchy(view_key, df_clean)
+    drill_country = st.selectbox("Drill into country", ["All countries"] + hierarchy["COUNTRY"].index.tolist())
+    country = None if drill_country == "All countries" else drill_country
+    st.plotly_chart(sales_treemap(hierarchy, country), use_container_width=True)
     st.markdown("""
     - Hierarchical view of sales distribution across countries and product lines.
+    - Select a country to drill down to its product codes; smaller codes are grouped into "Other".
     - Color intensity represents quantity sold.
     """)
 
@@ -66,10 +92,74 @@ def show(df_clean, tables):
     - Deep Dive can further explore regional strategies.
     """)
 
+    # Product affinity (market basket)
+    st.subheader("Product Affinity")
+    affinity = get_product_affinity(view_key, df_clean)
+    st.plotly_chart(product_affinity_heatmap(affinity["PRODUCTLINE"]["lift"]), use_container_width=True)
+    st.markdown("**Products bought together** (product codes, pairs in at least two orders)")
+    table_viewer(
+        affinity["PRODUCTCODE"]["pairs"], key="product_pairs",
+        formats={"SUPPORT": "percent", "CONFIDENCE_A_B": "percent", "CONFIDENCE_B_A": "percent", "LIFT": "%.2f"},
+    )
+    st.markdown(f"""
+    - Based on {affinity['orders']:,} orders. Lift above 1 means two products appear in the same order more often than chance.
+    - Confidence A→B is the share of orders with A that also contain B.
+    """)
+
+    # Top-N leaderboards
+    st.subheader("Leaderboards")
+    leaderboard_panel(get_leaderboards(view_key, df_clean))
+    st.markdown("""
+    - Top customers, product codes and cities under the sidebar filters; share is of the filtered total.
+    """)
+
     # NEW: Correlation Heatmap
     st.subheader("Numerical Variables Correlation")
-    st.plotly_chart(correlation_heatmap(df_clean), use_container_width=True)
+    segment_stats = get_segment_stats(view_key, df_clean)
+    col_seg, col_key = st.columns(2)
+    segment_col = col_seg.selectbox("Segment by", ["All"] + SEGMENT_COLUMNS)
+    if segment_col == "All":
+        state, segment, title = segment_stats[None], "All", "Numerical Variables Correlation Heatmap"
+    else:
+        state = segment_stats[segment_col]
+        segment = col_key.selectbox(segment_col.title(), state["keys"].tolist())
+        title = f"Numerical Variables Correlation Heatmap ({segment_col}: {segment})"
+    st.plotly_chart(correlation_heatmap(correlation_matrix(state, segment), title), use_container_width=True)
     st.markdown("""
     - Identify relationships between numerical variables like sales, quantity, price, etc.
+    - Segment by product line, country or deal size to compare relationships across groups.
     - Strong correlations (red/blue) indicate potential business insights.
-    """)
\ No newline at end of file
+    """)
+
+    # Data export
+    st.subheader("Data Export")
+    export_widget({
+        "Filtered line items": df_clean,
+        "Monthly timeseries": tables["timeseries"],
+        "Sales by country": tables["by_region"],
+        "Sales forecast": lambda: get_forecast_panel(view_key, df_clean),
+    }, "auto_sales", key="overview")
+    st.markdown("""
+    - Exports follow the sidebar filters; files are generated only when requested.
+    """)
+
+
+@st.fragment
+def leaderboard_panel(boards):
+    """
+    Top-N customers, product codes and cities; reruns on its own / 排行榜面板（局部重跑）
+    """
+    col_metric, col_n = st.columns(2)
+    metric = col_metric.radio("Rank by", LEADERBOARD_METRICS, horizontal=True, key="leaderboard_metric",
+                              format_func=lambda m: "Sales" if m == "SALES" else "Quantity")
+    n = col_n.slider("Top N", 5, 50, TOP_N, 5, key="leaderboard_n")
+    value_format = "dollar" if metric == "SALES" else "%d"
+    for col, (key, state) in zip(st.columns(len(boards)), boards.items()):
+        col.markdown(f"**{key.title()}**")
+        col.dataframe(
+            top_n(state, metric, n), hide_index=True, use_container_width=True,
+            column_config={
+                metric: st.column_config.NumberColumn(format=value_format),
+                "SHARE": st.column_config.NumberColumn(format="percent"),
+            },
+        )
@@ -0,0 +1,93 @@
+"""
+Price anomaly detection against MSRP / 基于 MSRP 的价格异常检测
+
+Each order line's price-to-MSRP ratio is compared with the median of its
+product code (or of its product line when the code has too few lines)
+using a robust z-score, median / MAD, computed with grouped transforms.
+"""
+import numpy as np
+import pandas as pd
+
+# 细到粗的分组层级 / Grouping levels, finest first
+PRICE_GROUPS = ["PRODUCTCODE", "PRODUCTLINE"]
+MIN_GROUP_SIZE = 8
+Z_THRESHOLD = 3.5
+MAD_SCALE = 0.6745        # 正态分布下 MAD 与标准差的换算 / MAD to sigma under normality
+MEAN_AD_SCALE = 0.7979    # MAD 为 0 时改用平均绝对偏差 / used when the MAD is zero
+
+ANOMALY_COLUMNS = [
+    "ORDERNUMBER", "ORDERLINENUMBER", "ORDERDATE", "CUSTOMERNAME", "COUNTRY",
+    "PRODUCTLINE", "PRODUCTCODE", "PRICEEACH", "MSRP", "QUANTITYORDERED",
+]
+
+
+def price_diff_ratio(df):
+    """
+    (PRICEEACH - MSRP) / MSRP as a float array / 售价相对 MSRP 的偏离比例
+    """
+    msrp = df["MSRP"].to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(msrp > 0, (df["PRICEEACH"].to_numpy(dtype=float) - msrp) / msrp, np.nan)
+
+
+def robust_zscores(values, keys):
+    """
+    Robust z-score of each value within its group / 组内稳健 z 分数
+    Returns (z, group median, group size) aligned with values.
+    """
+    grouped = pd.Series(values).groupby(keys, sort=False, observed=True)
+    median = grouped.transform("median").to_numpy()
+    deviation = pd.Series(np.abs(values - median))
+    grouped_dev = deviation.groupby(keys, sort=False, observed=True)
+    mad = grouped_dev.transform("median").to_numpy()
+    mean_ad = grouped_dev.transform("mean").to_numpy()
+    size = grouped.transform("size").to_numpy()
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = np.where(mad > 0, MAD_SCALE * (values - median) / mad,
+                     (values - median) / (mean_ad / MEAN_AD_SCALE))
+    z = np.where(np.isfinite(z), z, 0.0)
+    return z, median, size
+
+
+def detect_price_anomalies(df_clean, groups=PRICE_GROUPS, min_group_size=MIN_GROUP_SIZE, threshold=Z_THRESHOLD):
+    """
+    Score every order line against its peer group / 为每个订单行打分
+    Lines fall back to the next coarser level while their group has fewer
+    than min_group_size lines. Returns a frame aligned with df_clean.index:
+    PRICE_DIFF_RATIO, GROUP_LEVEL, GROUP_MEDIAN, ROBUST_Z and IS_ANOMALY.
+    """
+    ratio = price_diff_ratio(df_clean)
+    z = np.zeros(len(df_clean))
+    median = np.full(len(df_clean), np.nan)
+    level = np.full(len(df_clean), groups[-1], dtype=object)
+    unassigned = np.ones(len(df_clean), dtype=bool)
+
+    for i, column in enumerate(groups):
+        if not unassigned.any():
+            break
+        codes, _ = pd.factorize(df_clean[column], sort=False)
+        level_z, level_median, size = robust_zscores(ratio, codes)
+        use = unassigned & ((size >= min_group_size) | (i == len(groups) - 1))
+        z[use], median[use], level[use] = level_z[use], level_median[use], column
+        unassigned &= ~use
+
+    return pd.DataFrame({
+        "PRICE_DIFF_RATIO": ratio,
+        "GROUP_LEVEL": level,
+        "GROUP_MEDIAN": median,
+        "ROBUST_Z": z,
+        "IS_ANOMALY": np.abs(z) >= threshold,
+    }, index=df_clean.index)
+
+
+def anomaly_table(df_clean, df_scores, threshold=Z_THRESHOLD, top_n=None):
+    """
+    Anomalous lines ranked by |robust z| / 按异常程度排序的明细表
+    """
+    flagged = np.abs(df_scores["ROBUST_Z"].to_numpy()) >= threshold
+    columns = [c for c in ANOMALY_COLUMNS if c in df_clean.columns]
+    df_anomalies = pd.concat([df_clean.loc[flagged, columns], df_scores.loc[flagged]], axis=1)
+    order = np.argsort(-np.abs(df_anomalies["ROBUST_Z"].to_numpy()), kind="stable")
+    df_anomalies = df_anomalies.iloc[order].drop(columns="IS_ANOMALY")
+    return df_anomalies.head(top_n) if top_n else df_anomalies
@@ -0,0 +1,265 @@
+"""
+Cached computed artifacts shared by pages and the warm-up task / 共享的缓存计算结果
+
+Every page and the background warm-up call the same cached functions, so
+whichever computes an artifact first publishes it for all sessions. Under
+the in-process st.cache_data layer, results are also kept in the shared disk
+cache, so other worker processes reuse them too.
+
+Artifact functions are keyed by view_key(version, selection) and take the
+frame as _df_clean, which is not hashed: hashing frames is slow, and
+st.cache_data only samples large frames. The key covers the versions of the
+data files the view's rows come from, not the whole dataset, so after a
+file changes, views that read none of its rows keep their cached artifacts.
+Only unfiltered views go to the disk cache.
+
+The raw and clean frames are held once per process and handed out as
+Copy-on-Write views: callers may add columns or modify values freely, pandas
+copies only what they write, and the shared frame is never changed.
+invalidate_data drops the old version's frames and the cached frames of the
+changed files; artifacts of views that depended on them are never hit again
+and age out of their bounded caches.
+"""
+import hashlib
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils.disk_cache import disk_cached
+from utils.io import load_data
+from utils.prep import preprocess_data, make_tables, make_treemap_hierarchy
+from utils.prep import make_retention_matrix, make_country_clusters
+from utils.filters import build_filter_index
+from utils.stats import build_segment_stats
+from utils.forecast import forecast_panel
+from utils.metrics import compute_period_metrics
+from utils.customers import build_customer_table
+from utils.orders import build_order_table
+from utils.basket import product_affinity
+from utils.leaderboard import build_leaderboards
+from utils.whatif import build_price_cube
+from utils.anomaly import detect_price_anomalies
+
+# 写时复制：派生列不复制原表，共享表不会被改写 / Copy-on-Write for every shared frame
+pd.set_option("mode.copy_on_write", True)
+
+# 每个函数保留的筛选视图数 / Filtered views kept per artifact function
+ARTIFACT_MAX_ENTRIES = 16
+
+
+def _filtered_view(arguments):
+    # 筛选视图很少被其他进程复用，只在内存中缓存 / Filtered views are rarely shared; keep them in memory only
+    return arguments["view_key"][1] is not None
+
+
+def get_raw_data(version):
+    """
+    Load raw dataset once per data version / 每个数据版本只加载一次原始数据
+    Returns a Copy-on-Write view of the shared frame.
+    """
+    return _shared_raw_data(version)[0].copy(deep=False)
+
+
+def get_clean_data(version):
+    """
+    Cleaned dataset, once per data version / 每个数据版本只清洗一次
+    Returns a Copy-on-Write view of the shared frame.
+    """
+    return _shared_clean_data(version)[0].copy(deep=False)
+
+
+def get_duplicate_report(version):
+    """
+    Duplicate order lines removed while cleaning / 清洗时去除的重复订单行
+    Built by the same preprocessing pass as the clean frame.
+    """
+    return _shared_clean_data(version)[1].copy(deep=False)
+
+
+@st.cache_data(show_spinner=False, max_entries=ARTIFACT_MAX_ENTRIES)
+def view_key(version, selection=None, _positions=None):
+    """
+    Cache key of a (filtered) view: (input digest, selection) / 视图的缓存键
+    selection comes from utils.filters.normalize_selection and _positions from
+    resolve_filters; the selection is None when every row is selected. The
+    input digest covers the path and version of every file contributing rows
+    to the view, plus what couples files together: the first file (date
+    format inference), the raw dtypes and the duplicate report.
+    """
+    df_raw, sources = _shared_raw_data(version)
+    df_clean, duplicate_report = _shared_clean_data(version)
+    if _positions is None or len(_positions) == len(df_clean):
+        selection, files = None, np.arange(len(sources))
+    else:
+        # 清洗后的行标签即原始行号，据此找到来源文件 / Clean row labels are raw row numbers, which map to files
+        boundaries = np.cumsum([rows for _, _, rows in sources])
+        files = np.unique(np.searchsorted(boundaries, df_clean.index.to_numpy()[_positions], side="right"))
+    files = np.union1d(files, [0]) if sources else files
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr([sources[i][:2] for i in files]).encode())
+    digest.update(repr([str(t) for t in df_raw.dtypes]).encode())
+    digest.update(pd.util.hash_pandas_object(duplicate_report, index=False).to_numpy().tobytes())
+    return (digest.hexdigest(), selection)
+
+
+@st.cache_data(show_spinner=False, max_entries=ARTIFACT_MAX_ENTRIES)
+@disk_cached(skip=_filtered_view)
+def get_filter_index(view_key, _df_clean):
+    """
+    Build global filter indexes once per dataset / 每个数据集只构建一次筛选索引
+    """
+    return build_filter_index(_df_clean)
+
+
+@st.cache_data(show_spinner=False, max_entries=ARTIFACT_MAX_ENTRIES)
+@disk_cached(skip=_filtered_view)
+def get_order_table(view_key, _df_clean):
+    """
+    One row per order: total, lines, quantity, date, customer, country / 订单事实表
+    """
+    return build_order_table(_df_clean)
+
+
+@st.cache_data(show_spinner=False, max_entries=ARTIFACT_MAX_ENTRIES)
+@disk_cached(skip=_filtered_view)
+def get_tables(view_key, _df_clean):
+    """
+    Overview summary tables / 总览汇总表
+    """
+    return make_tables(_df_clean, get_order_table(view_key, _df_clean))
+
+
+@st.cache_data(show_spinner=False, max_entries=ARTIFACT_MAX_ENTRIES)
+@disk_cached(skip=_filtered_view)
+def get_treemap_hierarchy(view_key, _df_clean):
+    """
+    Treemap aggregates, computed once per dataset / 树状图汇总，每个数据集只计算一次
+    """
+    return make_treemap_hierarchy(_df_clean)
+
+
+@st.cache_data(show_spinner=False, max_entries=ARTIFACT_MAX_ENTRIES)
+@disk_cached(skip=_filtered_view)
+def get_product_affinity(view_key, _df_clean):
+    """
+    Market basket co-occurrence, support and lift / 购物篮共购分析
+    """
+    return product_affinity(_df_clean)
+
+
+@st.cache_data(show_spinner=False, max_entries=ARTIFACT_MAX_ENTRIES)
+@disk_cached(skip=_filtered_view)
+def get_leaderboards(view_key, _df_clean):
+    """
+    Per-key totals behind the top-N leaderboards / 排行榜汇总状态
+    """
+    return build_leaderboards(_df_clean)
+
+
+@st.cache_data(show_spinner=False, max_entries=ARTIFACT_MAX_ENTRIES)
+@disk_cached(skip=_filtered_view)
+def get_segment_stats(view_key, _df_clean):
+    """
+    Segmented co-moments, computed once per dataset / 分组协矩，每个数据集只计算一次
+    """
+    return build_segment_stats(_df_clean)
+
+
+@st.cache_data(show_spinner=False, max_entries=ARTIFACT_MAX_ENTRIES)
+@disk_cached(skip=_filtered_view)
+def get_forecast_panel(view_key, _df_clean):
+    """
+    COUNTRY x PRODUCTLINE monthly sales history and forecast / 国家 x 产品线销售预测
+    """
+    return forecast_panel(_df_clean, model="holt_winters_tuned")
+
+
+@st.cache_data(show_spinner=False, max_entries=ARTIFACT_MAX_ENTRIES)
+@disk_cached(skip=_filtered_view)
+def get_period_metrics(view_key, _df_clean, dim="COUNTRY"):
+    """
+    Monthly YoY / MoM / rolling metrics for one dimension / 某一维度的周期指标
+    """
+    return compute_period_metrics(_df_clean, dim)
+
+
+@st.cache_data(show_spinner=False, max_entries=ARTIFACT_MAX_ENTRIES)
+@disk_cached(skip=_filtered_view)
+def get_price_anomalies(view_key, _df_clean):
+    """
+    Robust price-vs-MSRP scores for every order line / 每个订单行的价格异常分数
+    """
+    return detect_price_anomalies(_df_clean)
+
+
+@st.cache_data(show_spinner=False, max_entries=ARTIFACT_MAX_ENTRIES)
+@disk_cached(skip=_filtered_view)
+def get_price_cube(view_key, _df_clean):
+    """
+    Base sales per product line x country x deal size x month cell / 价格模拟基准立方体
+    """
+    return build_price_cube(_df_clean)
+
+
+@st.cache_data(show_spinner=False, max_entries=ARTIFACT_MAX_ENTRIES)
+@disk_cached(skip=_filtered_view)
+def get_customer_table(view_key, _df_clean):
+    """
+    One row per customer with RFM scores and cohort / 客户维度表
+    """
+    return build_customer_table(_df_clean, get_order_table(view_key, _df_clean))
+
+
+@st.cache_data(show_spinner=False, max_entries=ARTIFACT_MAX_ENTRIES)
+@disk_cached(skip=_filtered_view)
+def get_retention_matrix(view_key, _df_clean):
+    """
+    Customer cohort retention matrix / 客户留存矩阵
+    """
+    return make_retention_matrix(_df_clean, get_customer_table(view_key, _df_clean))
+
+
+@st.cache_data(show_spinner=False, max_entries=ARTIFACT_MAX_ENTRIES)
+@disk_cached(skip=_filtered_view)
+def get_country_clusters(view_key, _df_clean):
+    """
+    Country clustering (feature matrix + ward linkage) / 国家聚类结果
+    """
+    return make_country_clusters(_df_clean)
+
+
+def invalidate_data(old_version, changed_paths=()):
+    """
+    Drop data made stale by a change / 数据变化后清除失效的缓存
+    Removes the old version's raw and clean frames and the per-file frames of
+    changed_paths. Artifact caches are left alone: views whose rows come only
+    from unchanged files keep the same view_key and still hit.
+    """
+    _shared_clean_data.clear(old_version)
+    _shared_raw_data.clear(old_version)
+    cache = _file_cache()
+    changed = set(changed_paths)
+    for key in [k for k in list(cache) if k[0] in changed]:
+        cache.pop(key, None)
+
+
+# 每个进程只保留一份，不像 cache_data 那样每次反序列化 / One instance per process, not unpickled per call like cache_data
+@st.cache_resource(show_spinner=False, max_entries=2)
+@disk_cached
+def _shared_raw_data(version):
+    # (raw frame, [(path, file version, rows)]) / 原始表及各文件行数
+    return load_data(file_cache=_file_cache(), with_sources=True)
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+@disk_cached
+def _shared_clean_data(version):
+    # (clean frame, duplicate report) 一次清洗同时得到 / one cleaning pass yields both
+    return preprocess_data(_shared_raw_data(version)[0], with_report=True)
+
+
+# 分区目录按文件缓存，只重读变化的文件 / Per-file frames of a partitioned dataset
+@st.cache_resource(show_spinner=False)
+def _file_cache():
+    return {}
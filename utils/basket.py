@@ -0,0 +1,102 @@
+"""
+Market basket analysis on a sparse order x product matrix / 稀疏矩阵购物篮分析
+
+Orders and products are factorized into a binary scipy.sparse incidence
+matrix X (orders x items). The co-occurrence counts are X.T @ X: the
+diagonal holds each item's order count and the off-diagonal entries count
+orders that contain both items. Support, confidence and lift follow from
+these counts, so memory grows with the number of co-occurring pairs, not
+with orders x items.
+"""
+import numpy as np
+import pandas as pd
+
+BASKET_ITEMS = ["PRODUCTLINE", "PRODUCTCODE"]
+MIN_PAIR_ORDERS = 2
+
+
+def incidence_matrix(df_clean, item="PRODUCTCODE", order="ORDERNUMBER", min_item_orders=1):
+    """
+    Binary order x item CSR matrix / 订单 x 商品 0/1 稀疏矩阵
+    Items bought in fewer than min_item_orders orders are dropped before any
+    product is formed. Returns (X, order labels, item labels).
+    """
+    from scipy import sparse
+
+    order_codes, orders = pd.factorize(df_clean[order], sort=True)
+    item_codes, items = pd.factorize(df_clean[item], sort=True)
+    valid = (order_codes >= 0) & (item_codes >= 0)
+    X = sparse.csr_matrix(
+        (np.ones(int(valid.sum()), dtype=np.int32), (order_codes[valid], item_codes[valid])),
+        shape=(len(orders), len(items)),
+    )
+    # 同一订单重复出现的商品只计一次 / Repeated lines of one item count once
+    X.sum_duplicates()
+    X.data[:] = 1
+
+    if min_item_orders > 1:
+        keep = np.flatnonzero(np.asarray(X.sum(axis=0)).ravel() >= min_item_orders)
+        X, items = X[:, keep], items[keep]
+    return X, orders, items
+
+
+def cooccurrence(X):
+    """
+    Item x item co-occurrence counts, X.T @ X / 共现次数矩阵
+    """
+    return (X.T @ X).tocsr()
+
+
+def association_pairs(X, items, min_pair_orders=MIN_PAIR_ORDERS):
+    """
+    Item pairs with support, confidence and lift / 商品对的支持度、置信度与提升度
+    Only pairs bought together in at least min_pair_orders orders are kept.
+    Columns: ITEM_A, ITEM_B, ORDERS, SUPPORT, CONFIDENCE_A_B, CONFIDENCE_B_A, LIFT.
+    """
+    from scipy import sparse
+
+    n_orders = X.shape[0]
+    C = cooccurrence(X)
+    item_orders = C.diagonal().astype(float)
+
+    # 只取上三角，每对商品一行 / Upper triangle: one row per unordered pair
+    pairs = sparse.triu(C, k=1).tocoo()
+    keep = pairs.data >= min_pair_orders
+    a, b, both = pairs.row[keep], pairs.col[keep], pairs.data[keep].astype(float)
+
+    df_pairs = pd.DataFrame({
+        "ITEM_A": np.asarray(items)[a],
+        "ITEM_B": np.asarray(items)[b],
+        "ORDERS": both.astype(int),
+        "SUPPORT": both / n_orders,
+        "CONFIDENCE_A_B": both / item_orders[a],
+        "CONFIDENCE_B_A": both / item_orders[b],
+        "LIFT": both * n_orders / (item_orders[a] * item_orders[b]),
+    })
+    return df_pairs.sort_values(["LIFT", "ORDERS"], ascending=False, ignore_index=True)
+
+
+def lift_matrix(X, items):
+    """
+    Dense item x item lift matrix for small catalogs (e.g. product lines) / 提升度矩阵
+    """
+    C = cooccurrence(X).toarray().astype(float)
+    item_orders = np.diag(C)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lift = C * X.shape[0] / np.outer(item_orders, item_orders)
+    np.fill_diagonal(lift, np.nan)
+    return pd.DataFrame(lift, index=items, columns=items)
+
+
+def product_affinity(df_clean, min_pair_orders=MIN_PAIR_ORDERS):
+    """
+    Basket results for both item levels / 两个层级的购物篮结果
+    Returns {"PRODUCTLINE": {"lift": matrix, "pairs": table}, "PRODUCTCODE": {"pairs": table}, "orders": n}.
+    """
+    X_line, _, lines = incidence_matrix(df_clean, "PRODUCTLINE")
+    X_code, orders, codes = incidence_matrix(df_clean, "PRODUCTCODE", min_item_orders=min_pair_orders)
+    return {
+        "orders": len(orders),
+        "PRODUCTLINE": {"lift": lift_matrix(X_line, lines), "pairs": association_pairs(X_line, lines, 1)},
+        "PRODUCTCODE": {"pairs": association_pairs(X_code, codes, min_pair_orders)},
+    }
@@ -0,0 +1,98 @@
+"""
+Customer dimension table / 客户维度表
+
+One row per customer, built once per dataset from the line items. Retention,
+RFM segmentation and customer KPIs read from this table instead of
+re-grouping line items every time.
+"""
+import numpy as np
+import pandas as pd
+
+RFM_BINS = 5
+
+# RFM 分段规则（按顺序匹配）/ Segment rules, first match wins: (name, min R, min F, min M)
+RFM_SEGMENTS = [
+    ("Champions", 4, 4, 4),
+    ("Loyal", 3, 4, 1),
+    ("Big Spenders", 1, 1, 5),
+    ("Recent", 4, 1, 1),
+    ("Promising", 3, 1, 1),
+    ("At Risk", 1, 3, 3),
+]
+DEFAULT_SEGMENT = "Hibernating"
+
+
+def build_customer_table(df_clean, df_orders):
+    """
+    Aggregate line items into one row per customer / 构建客户表
+    Order counts come from the order table.
+    Columns: COUNTRY, FIRST_ORDER, LAST_ORDER, ORDERS, LINES, REVENUE,
+    AVG_ORDER_VALUE, AVG_DEAL_SIZE, DAYS_SINCE_LASTORDER, RECENCY_DAYS,
+    COHORT, R/F/M scores, RFM_SCORE and SEGMENT.
+    """
+    df_customers = df_clean.groupby("CUSTOMERNAME").agg(
+        COUNTRY=("COUNTRY", "first"),
+        FIRST_ORDER=("ORDERDATE", "min"),
+        LAST_ORDER=("ORDERDATE", "max"),
+        LINES=("ORDERNUMBER", "size"),
+        REVENUE=("SALES", "sum"),
+        AVG_DEAL_SIZE=("SALES", "mean"),
+        DAYS_SINCE_LASTORDER=("DAYS_SINCE_LASTORDER", "min"),
+    )
+    df_customers.insert(3, "ORDERS", df_orders.groupby("CUSTOMERNAME").size())
+    df_customers["AVG_ORDER_VALUE"] = df_customers["REVENUE"] / df_customers["ORDERS"]
+
+    # 以数据集最后一天为基准 / Recency relative to the last order date in the data
+    as_of = df_customers["LAST_ORDER"].max()
+    df_customers["RECENCY_DAYS"] = (as_of - df_customers["LAST_ORDER"]).dt.days
+    df_customers["COHORT"] = df_customers["FIRST_ORDER"].dt.to_period("M")
+
+    scores = rfm_scores(df_customers["RECENCY_DAYS"], df_customers["ORDERS"], df_customers["REVENUE"])
+    for name, values in scores.items():
+        df_customers[name] = values
+    df_customers["RFM_SCORE"] = (
+        df_customers["R_SCORE"].astype(str) + df_customers["F_SCORE"].astype(str) + df_customers["M_SCORE"].astype(str)
+    )
+    df_customers["SEGMENT"] = rfm_segment(df_customers["R_SCORE"], df_customers["F_SCORE"], df_customers["M_SCORE"])
+    return df_customers
+
+
+def quantile_score(values, bins=RFM_BINS, ascending=True):
+    """
+    Vectorized 1..bins quantile score / 分位数打分
+    Ties share the same score; with ascending=False smaller values score higher.
+    """
+    pct = pd.Series(values).rank(method="average", pct=True, ascending=ascending).to_numpy()
+    return np.clip(np.ceil(pct * bins), 1, bins).astype(int)
+
+
+def rfm_scores(recency, frequency, monetary, bins=RFM_BINS):
+    """
+    Recency / frequency / monetary scores / RFM 打分
+    """
+    return {
+        "R_SCORE": quantile_score(recency, bins, ascending=False),
+        "F_SCORE": quantile_score(frequency, bins),
+        "M_SCORE": quantile_score(monetary, bins),
+    }
+
+
+def rfm_segment(r, f, m, rules=RFM_SEGMENTS, default=DEFAULT_SEGMENT):
+    """
+    Map RFM scores to named segments / RFM 分段
+    """
+    r, f, m = np.asarray(r), np.asarray(f), np.asarray(m)
+    conditions = [(r >= min_r) & (f >= min_f) & (m >= min_m) for _, min_r, min_f, min_m in rules]
+    return np.select(conditions, [name for name, *_ in rules], default=default)
+
+
+def segment_summary(df_customers):
+    """
+    Customers, revenue and average scores per segment / 各分段汇总
+    """
+    return df_customers.groupby("SEGMENT").agg(
+        CUSTOMERS=("REVENUE", "size"),
+        REVENUE=("REVENUE", "sum"),
+        AVG_ORDERS=("ORDERS", "mean"),
+        AVG_RECENCY_DAYS=("RECENCY_DAYS", "mean"),
+    ).sort_values("REVENUE", ascending=False)
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+# 订单行自然键 / Natural key of an order line
+KEY_COLUMNS = ["ORDERNUMBER", "ORDERLINENUMBER"]
+
+
+def dedup_state():
+    """
+    Empty dedup state: sorted key hashes and row fingerprints seen so far / 空去重状态
+    Memory grows with distinct lines (16 bytes each), not with row width.
+    """
+    return {"keys": np.empty(0, dtype=np.uint64), "fingerprints": np.empty(0, dtype=np.uint64)}
+
+
+def dedup_chunk(df, state, key_columns=KEY_COLUMNS, update_state=True):
+    """
+    Deduplicate one chunk against everything seen before / 对单个数据块去重
+    Exact duplicates (same fingerprint) are dropped. Rows that reuse a key
+    with different content are kept but flagged as conflicts.
+    With update_state=False (last chunk), only rows whose key repeats are
+    fingerprinted. Returns (kept rows, report rows, new state).
+    """
+    keys = pd.util.hash_pandas_object(df[key_columns], index=False).to_numpy()
+    key_seen_before = _isin_sorted(keys, state["keys"])
+    key_repeated = pd.Series(keys).duplicated(keep=False).to_numpy()
+    key_seen = key_seen_before | pd.Series(keys).duplicated().to_numpy()
+
+    # 只有键重复的行才可能是完全重复 / Only rows with a repeated key can be exact duplicates
+    candidate = key_seen_before | key_repeated
+    if update_state:
+        fingerprints = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        candidate_fps = fingerprints[candidate]
+    else:
+        candidate_fps = pd.util.hash_pandas_object(df[candidate], index=False).to_numpy()
+
+    exact = np.zeros(len(df), dtype=bool)
+    exact[candidate] = _isin_sorted(candidate_fps, state["fingerprints"]) | pd.Series(candidate_fps).duplicated().to_numpy()
+    conflict = key_seen & ~exact
+
+    flagged = exact | conflict
+    report = df[flagged].assign(DUPLICATE_TYPE=np.where(exact, "exact", "conflict")[flagged])
+    if update_state:
+        state = {
+            "keys": _merge_sorted(state["keys"], keys),
+            "fingerprints": _merge_sorted(state["fingerprints"], fingerprints),
+        }
+    return df[~exact], report, state
+
+
+def dedup_frame(df, chunk_rows=None, key_columns=KEY_COLUMNS):
+    """
+    Key-based deduplication of a whole frame, optionally chunk by chunk / 整表去重
+    Returns (deduplicated frame, duplicate report).
+    """
+    chunk_rows = chunk_rows or max(len(df), 1)
+    starts = range(0, len(df), chunk_rows)
+    state = dedup_state()
+    kept, reports = [], []
+    for start in starts:
+        is_last = start == starts[-1]
+        df_kept, report, state = dedup_chunk(
+            df.iloc[start:start + chunk_rows], state, key_columns, update_state=not is_last
+        )
+        kept.append(df_kept)
+        reports.append(report)
+    if not kept:
+        return df, df.assign(DUPLICATE_TYPE=pd.Series(dtype=object))
+    if len(kept) == 1:
+        return kept[0], reports[0]
+    return pd.concat(kept), pd.concat(reports)
+
+
+def _isin_sorted(values, sorted_values):
+    """Membership test against a sorted array via binary search"""
+    if len(sorted_values) == 0:
+        return np.zeros(len(values), dtype=bool)
+    pos = np.searchsorted(sorted_values, values).clip(max=len(sorted_values) - 1)
+    return sorted_values[pos] == values
+
+
+def _merge_sorted(sorted_values, values):
+    """Merge new values into a sorted unique array (stable sort merges the two runs)"""
+    merged = np.sort(np.concatenate([sorted_values, np.sort(values)]), kind="stable")
+    return merged[np.r_[True, merged[1:] != merged[:-1]]]
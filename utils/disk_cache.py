@@ -0,0 +1,218 @@
+"""
+Shared on-disk artifact cache / 跨进程共享的磁盘缓存
+
+st.cache_data only lives inside one process. This layer sits underneath it:
+on an in-process miss the artifact is looked up on local disk, keyed by the
+function, its arguments (DataFrames by content) and the code version, so a
+result computed by one Streamlit worker is reused by every other worker.
+
+- Writes go to a temp file in the cache directory and are published with
+  os.replace, so readers never see a partial file.
+- A per-key file lock (where fcntl is available) makes concurrent workers
+  wait for the first one instead of computing the same artifact twice.
+  Lock files are empty and never deleted, so every worker locks the same inode.
+- Entries are evicted least-recently-used first once the directory exceeds
+  its size budget; a hit refreshes the entry's mtime.
+"""
+import contextlib
+import functools
+import glob
+import hashlib
+import inspect
+import logging
+import os
+import pickle
+import tempfile
+import time
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: 仍然原子写入，只是不加锁 / still atomic, just unlocked
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# 设为空字符串可关闭磁盘缓存 / Set AUTO_SALES_CACHE_DIR to an empty string to disable
+CACHE_DIR = os.environ.get("AUTO_SALES_CACHE_DIR", os.path.join(".cache", "artifacts"))
+CACHE_MAX_BYTES = int(float(os.environ.get("AUTO_SALES_CACHE_MB", "512")) * 1024 * 1024)
+ENTRY_SUFFIX = ".pkl"
+STALE_TMP_SECONDS = 3600
+
+
+def disk_cached(func=None, *, cache_dir=None, max_bytes=None, skip=None):
+    """
+    Decorator: persist results on disk, shared across processes / 磁盘缓存装饰器
+    Like st.cache_data, parameters whose name starts with "_" are not part
+    of the key. Reads CACHE_DIR / CACHE_MAX_BYTES at call time unless overridden.
+    skip takes the bound arguments dict; calls for which it returns True bypass the disk.
+    """
+    if func is None:
+        return functools.partial(disk_cached, cache_dir=cache_dir, max_bytes=max_bytes, skip=skip)
+
+    name = f"{func.__module__}.{func.__qualname__}"
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        root = CACHE_DIR if cache_dir is None else cache_dir
+        if not root:
+            return func(*args, **kwargs)
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        if skip is not None and skip(bound.arguments):
+            return func(*args, **kwargs)
+        key = cache_key(name, {k: v for k, v in bound.arguments.items() if not k.startswith("_")})
+        return cached_call(root, key, lambda: func(*args, **kwargs),
+                           CACHE_MAX_BYTES if max_bytes is None else max_bytes)
+
+    return wrapper
+
+
+def cached_call(root, key, compute, max_bytes=CACHE_MAX_BYTES):
+    """
+    Return the cached value for key, computing and storing it on a miss / 读缓存或计算并写入
+    """
+    os.makedirs(os.path.join(root, "locks"), exist_ok=True)
+    path = os.path.join(root, key + ENTRY_SUFFIX)
+
+    value, hit = _read_entry(path)
+    if hit:
+        return value
+
+    with _key_lock(os.path.join(root, "locks", key + ".lock")):
+        # 等锁期间可能已被其他进程写好 / Another worker may have finished while we waited
+        value, hit = _read_entry(path)
+        if hit:
+            return value
+        value = compute()
+        _write_entry(root, path, value)
+
+    evict(root, max_bytes)
+    return value
+
+
+def cache_key(name, arguments):
+    """
+    Stable key from function name, code version and named arguments / 生成缓存键
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(name.encode())
+    digest.update(code_version().encode())
+    for arg_name in sorted(arguments):
+        digest.update(arg_name.encode())
+        _update_digest(digest, arguments[arg_name])
+    return f"{name.rsplit('.', 1)[-1]}-{digest.hexdigest()}"
+
+
+@functools.lru_cache(maxsize=None)
+def code_version():
+    """
+    Hash of the utils package source, so a deploy invalidates old entries / 代码版本
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    for path in sorted(glob.glob(os.path.join(package_dir, "**", "*.py"), recursive=True)):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def evict(root, max_bytes=CACHE_MAX_BYTES):
+    """
+    Delete least-recently-used entries until the cache fits its budget / 按 LRU 淘汰
+    """
+    entries = []
+    for path in glob.glob(os.path.join(root, "*" + ENTRY_SUFFIX)):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        # 锁文件保留：删除后新进程会在新 inode 上加锁 / Lock files stay: a new inode would let two workers lock at once
+        _remove(path)
+        total -= size
+
+    # 清理崩溃进程留下的临时文件 / Temp files left behind by crashed writers
+    cutoff = time.time() - STALE_TMP_SECONDS
+    for path in glob.glob(os.path.join(root, "*.tmp")):
+        try:
+            if os.stat(path).st_mtime < cutoff:
+                os.remove(path)
+        except FileNotFoundError:
+            pass
+    return total
+
+
+def clear(root=CACHE_DIR):
+    """
+    Remove every cached entry / 清空缓存
+    """
+    return evict(root, max_bytes=0)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _update_digest(digest, value):
+    if isinstance(value, pd.DataFrame):
+        digest.update(repr((list(value.columns), [str(t) for t in value.dtypes], value.shape)).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, pd.Series):
+        digest.update(repr((value.name, str(value.dtype))).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, (str, int, float, bool, type(None), tuple)):
+        digest.update(repr(value).encode())
+    else:
+        digest.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _read_entry(path):
+    try:
+        with open(path, "rb") as f:
+            value = pickle.load(f)
+    except FileNotFoundError:
+        return None, False
+    except Exception:  # 损坏的条目当作未命中 / A corrupt entry counts as a miss
+        logger.warning("Discarding unreadable cache entry %s", path, exc_info=True)
+        return None, False
+    try:
+        os.utime(path)  # 记录最近使用 / mark as recently used
+    except FileNotFoundError:
+        pass
+    return value, True
+
+
+def _write_entry(root, path, value):
+    fd, tmp_path = tempfile.mkstemp(dir=root, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except Exception:
+        _remove(tmp_path)
+        raise
+
+
+@contextlib.contextmanager
+def _key_lock(path):
+    """Exclusive advisory lock on a lock file; a no-op without fcntl"""
+    if fcntl is None:
+        yield
+        return
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
@@ -0,0 +1,172 @@
+"""
+On-demand chunked export of dashboard tables / 按需分块导出表格
+
+Nothing is serialized during a normal page render. The file is generated
+only when the user asks for it, written chunk by chunk to a temporary file
+so memory stays bounded, and only then handed to the download button.
+Export files live in one directory and are removed once they are older
+than EXPORT_MAX_AGE, so files of closed sessions do not pile up.
+"""
+import importlib.util
+import os
+import tempfile
+import time
+
+import streamlit as st
+
+EXPORT_CHUNK_ROWS = 50_000
+EXPORT_DIR = os.path.join(tempfile.gettempdir(), "auto_sales_exports")
+EXPORT_MAX_AGE = 3600  # 秒 / seconds
+EXCEL_MAX_ROWS = 1_048_575  # 表头占一行 / one row is taken by the header
+
+EXPORT_FORMATS = {
+    "CSV": {"extension": "csv", "mime": "text/csv"},
+    "Parquet": {"extension": "parquet", "mime": "application/vnd.apache.parquet"},
+    "Excel": {"extension": "xlsx", "mime": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"},
+}
+
+
+def available_formats():
+    """
+    Export formats whose optional dependency is installed / 可用的导出格式
+    """
+    formats = ["CSV"]
+    if importlib.util.find_spec("pyarrow") is not None:
+        formats.append("Parquet")
+    if importlib.util.find_spec("openpyxl") is not None:
+        formats.append("Excel")
+    return formats
+
+
+def write_export(df, fmt, fileobj, chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    Write a DataFrame to a binary file object in chunks / 分块写出到文件
+    """
+    chunks = (df.iloc[start:start + chunk_rows] for start in range(0, len(df), chunk_rows))
+
+    if fmt == "CSV":
+        fileobj.write(df.iloc[:0].to_csv(index=False).encode("utf-8"))
+        for chunk in chunks:
+            fileobj.write(chunk.to_csv(index=False, header=False).encode("utf-8"))
+
+    elif fmt == "Parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # schema 由整表推断，首块全空的列也能得到正确类型 / Schema from the full frame, not the first chunk
+        schema = pa.Schema.from_pandas(df, preserve_index=False)
+        with pq.ParquetWriter(fileobj, schema) as writer:
+            for chunk in chunks:
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+    elif fmt == "Excel":
+        from openpyxl import Workbook
+
+        if len(df) > EXCEL_MAX_ROWS:
+            raise ValueError(f"Excel sheets hold at most {EXCEL_MAX_ROWS:,} data rows; use CSV or Parquet")
+        # write_only 模式逐行落盘 / write-only workbooks stream rows to disk
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append([str(col) for col in df.columns])
+        for chunk in chunks:
+            for row in chunk.astype(object).where(chunk.notna(), None).itertuples(index=False):
+                sheet.append(list(row))
+        workbook.save(fileobj)
+
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+
+def export_to_tempfile(df, fmt, chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    Generate the export file on disk and return its path / 生成临时导出文件
+    Stale exports of earlier (possibly closed) sessions are removed first.
+    """
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    cleanup_exports()
+    handle = tempfile.NamedTemporaryFile(suffix=f".{EXPORT_FORMATS[fmt]['extension']}", dir=EXPORT_DIR, delete=False)
+    try:
+        with handle:
+            write_export(df, fmt, handle, chunk_rows)
+    except Exception:
+        os.remove(handle.name)
+        raise
+    return handle.name
+
+
+def cleanup_exports(max_age=EXPORT_MAX_AGE, export_dir=EXPORT_DIR):
+    """
+    Remove export files older than max_age seconds / 清理过期导出文件
+    """
+    cutoff = time.time() - max_age
+    with os.scandir(export_dir) as entries:
+        for entry in entries:
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError:  # 其他会话可能已删除 / another session may have removed it
+                pass
+
+
+@st.fragment
+def export_widget(tables, file_stem, key):
+    """
+    Export picker + lazy download button / 导出控件（按需生成文件）
+    tables maps a label to a DataFrame or to a callable returning one, so even
+    building the table is deferred until the export is requested. Runs as a
+    fragment, so its widgets do not rerun the page, and the prepared file is
+    discarded once downloaded, so later page reruns stop re-reading it.
+    """
+    state_key = f"export_{key}"
+    labels = list(tables)
+    col_table, col_fmt, col_go = st.columns([2, 1, 1])
+    label = col_table.selectbox("Table", labels, key=f"{state_key}_table") if len(labels) > 1 else labels[0]
+    fmt = col_fmt.selectbox("Format", available_formats(), key=f"{state_key}_format")
+
+    # 选择变化或文件已过期清理时丢弃 / Drop a prepared file once the selection changes or it expired
+    prepared = st.session_state.get(state_key)
+    if prepared and (prepared["request"] != (label, fmt) or not os.path.exists(prepared["path"])):
+        _discard(state_key)
+        prepared = None
+
+    if col_go.button("PREPARE EXPORT", key=f"{state_key}_prepare", use_container_width=True):
+        _discard(state_key)
+        table = tables[label]
+        df = table() if callable(table) else table
+        with st.spinner(f"Writing {len(df):,} rows as {fmt}…"):
+            try:
+                path = export_to_tempfile(df, fmt)
+            except ValueError as exc:
+                st.error(str(exc))
+                return
+        prepared = {"request": (label, fmt), "path": path, "rows": len(df)}
+        st.session_state[state_key] = prepared
+
+    if prepared:
+        name = label.lower().replace(" ", "_")
+        try:
+            f = open(prepared["path"], "rb")
+        except FileNotFoundError:  # 被其他会话的过期清理删除 / removed by another session's cleanup
+            st.session_state.pop(state_key, None)
+            st.info("The prepared export expired; prepare it again.")
+            return
+        with f:
+            st.download_button(
+                label=f"DOWNLOAD {fmt.upper()} ({prepared['rows']:,} ROWS)",
+                data=f,
+                file_name=f"{file_stem}_{name}.{EXPORT_FORMATS[fmt]['extension']}" if len(labels) > 1
+                else f"{file_stem}.{EXPORT_FORMATS[fmt]['extension']}",
+                mime=EXPORT_FORMATS[fmt]["mime"],
+                key=f"{state_key}_download",
+                on_click=_discard,
+                args=(state_key,),
+            )
+
+
+def _discard(state_key):
+    prepared = st.session_state.pop(state_key, None)
+    if prepared:
+        try:
+            os.remove(prepared["path"])
+        except FileNotFoundError:
+            pass
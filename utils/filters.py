@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# 全局筛选维度 / Dimensions exposed as global filters
+FILTER_COLUMNS = ["COUNTRY", "PRODUCTLINE", "DEALSIZE", "STATUS"]
+DATE_COLUMN = "ORDERDATE"
+
+
+def build_filter_index(df_clean, columns=FILTER_COLUMNS, date_col=DATE_COLUMN):
+    """
+    Precompute filter indexes / 预计算筛选索引
+    Each categorical column gets one packed bitmap per distinct value,
+    the date column gets a sorted position index for range lookups.
+    """
+    n_rows = len(df_clean)
+    index = {"n_rows": n_rows, "columns": {}}
+
+    # 分类列位图：每个取值一行，按位打包 / One packed bitmap row per value
+    for col in columns:
+        codes, values = pd.factorize(df_clean[col], sort=True)
+        # 逐个取值打包，峰值只有一行位图 / Pack one value at a time to keep the peak at one row
+        bitmaps = np.empty((len(values), (n_rows + 7) // 8), dtype=np.uint8)
+        for i in range(len(values)):
+            bitmaps[i] = np.packbits(codes == i)
+        index["columns"][col] = {
+            "values": values.tolist(),
+            "positions": {value: i for i, value in enumerate(values.tolist())},
+            "bitmaps": bitmaps,
+        }
+
+    # 日期排序索引（NaT 排在末尾）/ Sorted date index, NaT sorts last
+    dates = df_clean[date_col].to_numpy(dtype="datetime64[ns]")
+    order = np.argsort(dates, kind="stable")
+    sorted_dates = dates[order]
+    n_valid = int((~np.isnat(sorted_dates)).sum())
+    index["date"] = {"order": order, "sorted": sorted_dates[:n_valid]}
+
+    return index
+
+
+def resolve_filters(index, selection):
+    """
+    Resolve a filter selection into sorted row positions / 将筛选条件解析为行位置
+    selection maps column -> list of values, plus an optional "date_range"
+    (start, end) pair with an inclusive end day. Empty entries are ignored.
+    """
+    n_rows = index["n_rows"]
+    packed = None
+
+    # 同一列内取 OR，不同列之间取 AND / OR within a column, AND across columns
+    for col, entry in index["columns"].items():
+        values = selection.get(col)
+        if not values or len(values) == len(entry["values"]):
+            continue
+        rows = [entry["positions"][v] for v in values if v in entry["positions"]]
+        if rows:
+            col_bits = np.bitwise_or.reduce(entry["bitmaps"][rows], axis=0)
+        else:
+            col_bits = np.zeros(entry["bitmaps"].shape[1], dtype=np.uint8)
+        packed = col_bits if packed is None else packed & col_bits
+
+    if packed is None:
+        mask = np.ones(n_rows, dtype=bool)
+    else:
+        mask = np.unpackbits(packed, count=n_rows).astype(bool)
+
+    # 日期范围：二分查找排序索引 / Date range via binary search on the sorted index
+    date_range = selection.get("date_range")
+    if date_range:
+        start, end = date_range
+        sorted_dates = index["date"]["sorted"]
+        lo = np.searchsorted(sorted_dates, np.datetime64(pd.Timestamp(start)), side="left")
+        hi = np.searchsorted(sorted_dates, np.datetime64(pd.Timestamp(end) + pd.Timedelta(days=1)), side="left")
+        date_mask = np.zeros(n_rows, dtype=bool)
+        date_mask[index["date"]["order"][lo:hi]] = True
+        mask &= date_mask
+
+    return np.flatnonzero(mask)
+
+
+def normalize_selection(index, selection):
+    """
+    Hashable form of a filter selection, as resolve_filters applies it / 筛选条件的规范形式
+    Entries that do not filter (empty, or every value) are dropped, so the
+    result is a row-wise predicate that does not depend on the rest of the data.
+    """
+    normalized = []
+    for col, entry in index["columns"].items():
+        values = selection.get(col)
+        if values and len(values) != len(entry["values"]):
+            normalized.append((col, tuple(sorted(str(v) for v in values))))
+    if selection.get("date_range"):
+        normalized.append(("date_range", tuple(str(pd.Timestamp(d).date()) for d in selection["date_range"])))
+    return tuple(normalized)
+
+
+def apply_filters(df_clean, positions):
+    """
+    Select the filtered rows by position / 按行位置取出筛选结果
+    """
+    if len(positions) == len(df_clean):
+        return df_clean
+    return df_clean.take(positions)
+
+
+def sidebar_filters(index):
+    """
+    Draw global filter widgets in the sidebar / 侧边栏全局筛选控件
+    Widget keys live in session_state so the selection persists across pages.
+    """
+    st.sidebar.title("Filters")
+    selection = {}
+    for col, entry in index["columns"].items():
+        selection[col] = st.sidebar.multiselect(
+            col.title(),
+            entry["values"],
+            placeholder="All",
+            key=f"filter_{col}",
+        )
+
+    sorted_dates = index["date"]["sorted"]
+    if len(sorted_dates):
+        min_date = pd.Timestamp(sorted_dates[0]).date()
+        max_date = pd.Timestamp(sorted_dates[-1]).date()
+        date_range = st.sidebar.date_input(
+            "Order Date Range",
+            value=(min_date, max_date),
+            min_value=min_date,
+            max_value=max_date,
+            key="filter_date_range",
+        )
+        if isinstance(date_range, (list, tuple)) and len(date_range) == 2:
+            selection["date_range"] = tuple(date_range)
+
+    return selection
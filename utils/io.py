@@ -1,8 +1,40 @@
+import os
 import pandas as pd
+from utils.dataset import load_dataset, dataset_version, file_version, partition_versions
 
-def load_data(path="data\Auto Sales data.csv"):
+# 单个 CSV 文件或分区目录 / A single CSV file or a partitioned dataset directory
+DATA_PATH = os.environ.get("AUTO_SALES_DATA", os.path.join("data", "Auto Sales data.csv"))
+
+def load_data(path=DATA_PATH, date_range=None, filters=None, file_cache=None, with_sources=False):
     """
-    Load dataset from CSV / 从 CSV 文件加载数据
+    Load dataset from CSV or a partitioned directory / 从 CSV 文件或分区目录加载数据
+    date_range and filters prune partitions and only apply to directories;
+    file_cache lets a directory re-read only the files that changed.
+    With with_sources=True, also returns [(path, file version, rows)] in row order.
     """
+    if os.path.isdir(path):
+        return load_dataset(path, date_range=date_range, filters=filters, file_cache=file_cache,
+                            with_sources=with_sources)
+    version = file_version(path)
     df = pd.read_csv(path)
+    if with_sources:
+        return df, [(path, version, len(df))]
     return df
+
+def file_versions(path=DATA_PATH):
+    """
+    Version tag of every input file / 各输入文件的版本标识
+    """
+    if os.path.isdir(path):
+        return partition_versions(path)
+    return {path: file_version(path)}
+
+def data_version(path=DATA_PATH, versions=None):
+    """
+    Cheap version tag of the data (size + mtime) / 数据文件版本标识
+    Used as cache key so derived artifacts are rebuilt only when the file changes.
+    versions, from file_versions, avoids a second stat of every file.
+    """
+    if os.path.isdir(path):
+        return dataset_version(path, versions)
+    return versions[path] if versions else file_version(path)
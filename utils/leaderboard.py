@@ -0,0 +1,86 @@
+"""
+Top-N leaderboards / 排行榜
+
+A leaderboard state holds, for one key column, the distinct keys and their
+metric totals (np.bincount over factorized codes, one pass over the rows).
+States of different chunks or partitions merge exactly by summing totals
+per key, so a dataset can be folded chunk by chunk with memory bounded by
+the number of distinct keys. The top N is picked with np.argpartition and
+only those N rows are sorted, never the whole key set.
+"""
+import numpy as np
+import pandas as pd
+
+LEADERBOARD_KEYS = ["CUSTOMERNAME", "PRODUCTCODE", "CITY"]
+LEADERBOARD_METRICS = ["SALES", "QUANTITYORDERED"]
+TOP_N = 10
+
+
+def key_totals(df, key, metrics=LEADERBOARD_METRICS):
+    """
+    Metric totals per distinct key / 按键汇总指标
+    Returns {"key", "labels", "totals": {metric: array}}; rows without a key are skipped.
+    """
+    codes, labels = pd.factorize(df[key])
+    valid = codes >= 0
+    totals = {
+        m: np.bincount(codes[valid], weights=df[m].to_numpy(dtype=float)[valid], minlength=len(labels))
+        for m in metrics
+    }
+    return {"key": key, "labels": pd.Index(labels), "totals": totals}
+
+
+def merge_totals(states):
+    """
+    Merge leaderboard states of several chunks or partitions / 合并各分块的汇总
+    Exact: a key split across chunks gets the sum of its partial totals.
+    """
+    states = list(states)
+    codes, labels = pd.factorize(np.concatenate([np.asarray(s["labels"], dtype=object) for s in states]))
+    totals = {
+        m: np.bincount(codes, weights=np.concatenate([s["totals"][m] for s in states]), minlength=len(labels))
+        for m in states[0]["totals"]
+    }
+    return {"key": states[0]["key"], "labels": pd.Index(labels), "totals": totals}
+
+
+def chunked_totals(chunks, key, metrics=LEADERBOARD_METRICS):
+    """
+    Fold an iterable of frames into one state / 逐块汇总
+    e.g. pd.read_csv(..., chunksize=...) or the frames of a partitioned dataset.
+    """
+    state = None
+    for chunk in chunks:
+        part = key_totals(chunk, key, metrics)
+        state = part if state is None else merge_totals([state, part])
+    return state
+
+
+def top_n(state, metric, n=TOP_N):
+    """
+    Top n keys by a metric with partial selection / 部分选择取前 n 名
+    Columns: RANK, <key>, <metric>, SHARE (of the metric total).
+    """
+    values = state["totals"][metric]
+    n = min(n, len(values))
+    if n < len(values):
+        positions = np.sort(np.argpartition(-values, n - 1)[:n])
+    else:
+        positions = np.arange(n)
+    # 同值按出现顺序 / Ties keep first-seen order
+    positions = positions[np.argsort(-values[positions], kind="stable")]
+
+    total = values.sum()
+    return pd.DataFrame({
+        "RANK": np.arange(1, n + 1),
+        state["key"]: state["labels"][positions],
+        metric: values[positions],
+        "SHARE": values[positions] / total if total else np.nan,
+    })
+
+
+def build_leaderboards(df_clean, keys=LEADERBOARD_KEYS, metrics=LEADERBOARD_METRICS):
+    """
+    Leaderboard state for every key column / 各维度的排行榜状态
+    """
+    return {key: key_totals(df_clean, key, metrics) for key in keys if key in df_clean.columns}
@@ -0,0 +1,88 @@
+"""
+Period-over-period metrics / 环比、同比与滚动指标
+
+Metrics are computed on a dimension-by-month matrix with array shifts and
+cumulative sums, so every year and every member of a dimension comes out of
+a single pass over the monthly panel.
+"""
+import numpy as np
+import pandas as pd
+
+from utils.forecast import make_series_matrix
+
+METRIC_LABELS = {
+    "SALES": "Sales",
+    "MOM": "MoM Change",
+    "MOM_PCT": "MoM Growth",
+    "YOY": "YoY Change",
+    "YOY_PCT": "YoY Growth",
+    "ROLL_3": "Rolling 3-Month Sales",
+    "ROLL_12": "Rolling 12-Month Sales",
+    "ROLL_3_GROWTH": "Rolling 3-Month Growth",
+    "ROLL_12_GROWTH": "Rolling 12-Month Growth",
+}
+GROWTH_METRICS = ["MOM_PCT", "YOY_PCT", "ROLL_3_GROWTH", "ROLL_12_GROWTH"]
+
+
+def period_metrics(Y):
+    """
+    Period-over-period metrics for a (series, month) matrix / 矩阵形式的周期指标
+    Values that need more history than available are NaN.
+    """
+    return {
+        "MOM": _diff(Y, 1),
+        "MOM_PCT": _growth(Y, 1),
+        "YOY": _diff(Y, 12),
+        "YOY_PCT": _growth(Y, 12),
+        "ROLL_3": _rolling_sum(Y, 3),
+        "ROLL_12": _rolling_sum(Y, 12),
+        "ROLL_3_GROWTH": _growth(_rolling_sum(Y, 3), 3),
+        "ROLL_12_GROWTH": _growth(_rolling_sum(Y, 12), 12),
+    }
+
+
+def compute_period_metrics(df_clean, dim="COUNTRY", measure="SALES"):
+    """
+    Long table of monthly values and metrics for one dimension / 某一维度的月度指标长表
+    Columns: dim, ORDERDATE, YEAR, MONTH, measure and every metric in METRIC_LABELS.
+    """
+    keys, months, Y = make_series_matrix(df_clean, [dim], measure)
+    metrics = period_metrics(Y)
+
+    df_metrics = pd.DataFrame({
+        dim: np.repeat(keys.to_numpy(), len(months)),
+        "ORDERDATE": np.tile(months.to_timestamp(), len(keys)),
+        "YEAR": np.tile(months.year, len(keys)),
+        "MONTH": np.tile(months.month, len(keys)),
+        measure: Y.ravel(),
+    })
+    for name, values in metrics.items():
+        df_metrics[name] = values.ravel()
+    return df_metrics
+
+
+def _shift(Y, periods):
+    out = np.full(Y.shape, np.nan)
+    if periods < Y.shape[1]:
+        out[:, periods:] = Y[:, :-periods]
+    return out
+
+
+def _diff(Y, periods):
+    return Y - _shift(Y, periods)
+
+
+def _growth(Y, periods):
+    previous = _shift(Y, periods)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(previous > 0, Y / previous - 1, np.nan)
+
+
+def _rolling_sum(Y, window):
+    """Trailing window sums via a cumulative sum"""
+    cum = np.cumsum(Y, axis=1)
+    out = np.full(Y.shape, np.nan)
+    if window <= Y.shape[1]:
+        out[:, window - 1] = cum[:, window - 1]
+        out[:, window:] = cum[:, window:] - cum[:, :-window]
+    return out
@@ -0,0 +1,51 @@
+"""
+Order-level fact table / 订单事实表
+
+The dataset is at order-line grain. This table has one row per ORDERNUMBER,
+so order counts, average order value (AOV) and basket size come from plain
+counts and sums instead of repeated distinct counts over line items.
+"""
+import numpy as np
+import pandas as pd
+
+DEALSIZE_ORDER = ["Small", "Medium", "Large"]
+
+
+def build_order_table(df_clean):
+    """
+    Aggregate line items into one row per order / 构建订单表
+    Columns: ORDERDATE, CUSTOMERNAME, COUNTRY, STATUS, DEALSIZE (largest
+    line deal size), SALES, LINES, QUANTITYORDERED and PRODUCTLINES.
+    """
+    grouped = df_clean.groupby("ORDERNUMBER", sort=True)
+    df_orders = grouped.agg(
+        ORDERDATE=("ORDERDATE", "first"),
+        CUSTOMERNAME=("CUSTOMERNAME", "first"),
+        COUNTRY=("COUNTRY", "first"),
+        STATUS=("STATUS", "first"),
+        SALES=("SALES", "sum"),
+        LINES=("SALES", "size"),
+        QUANTITYORDERED=("QUANTITYORDERED", "sum"),
+        PRODUCTLINES=("PRODUCTLINE", "nunique"),
+    )
+
+    # 订单内各行规模不同，取最大一档 / Lines of one order differ in deal size; keep the largest
+    size_codes = pd.Categorical(df_clean["DEALSIZE"], categories=DEALSIZE_ORDER, ordered=True).codes
+    largest = pd.Series(size_codes, index=df_clean.index).groupby(df_clean["ORDERNUMBER"], sort=True).max()
+    df_orders["DEALSIZE"] = pd.Categorical.from_codes(largest.to_numpy(), categories=DEALSIZE_ORDER, ordered=True)
+    return df_orders
+
+
+def order_kpis(df_orders):
+    """
+    Order count, AOV and basket size / 订单数、客单价与购物篮大小
+    """
+    n_orders = len(df_orders)
+    if n_orders == 0:
+        return {"orders": 0, "aov": np.nan, "basket_lines": np.nan, "basket_units": np.nan}
+    return {
+        "orders": n_orders,
+        "aov": df_orders["SALES"].sum() / n_orders,
+        "basket_lines": df_orders["LINES"].sum() / n_orders,
+        "basket_units": df_orders["QUANTITYORDERED"].sum() / n_orders,
+    }
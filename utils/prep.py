@@ -1,55 +1,133 @@
 import pandas as pd
+import numpy as np
+from utils.dedup import dedup_frame
+from utils.orders import order_kpis
 
-def preprocess_data(df_raw):
+def preprocess_data(df_raw, with_report=False):
     """
     Clean raw dataset / 清洗原始数据
+    With with_report=True, also returns the duplicate report.
     """
 
-    df = df_raw.copy()
+    # 去掉字符串前后空格，只处理文本列 / Trim whitespace, text columns only
+    # 其余列在写时复制下与原表共享 / other columns stay shared with df_raw under Copy-on-Write
+    text_cols = df_raw.columns[df_raw.dtypes == object]
+    df = df_raw.assign(**{col: df_raw[col].map(_strip) for col in text_cols})
 
-    # 去掉字符串前后空格 / Trim whitespace
-    df = df.applymap(lambda x: x.strip() if isinstance(x, str) else x)
-
-    # 删除重复行 / Drop duplicate rows
-    df = df.drop_duplicates()
+    # 按订单行键去重 / Drop duplicate order lines (key + row fingerprint)
+    df, duplicate_report = dedup_frame(df)
 
     # 日期列转换 / Convert date columns
     datetime_cols = [col for col in df.columns if "date" in col.lower()]
     for col in datetime_cols:
         df[col] = pd.to_datetime(df[col], errors='coerce')
 
+    if with_report:
+        return df, duplicate_report
     return df
 
-def make_tables(df_clean):
+def _strip(value):
+    return value.strip() if isinstance(value, str) else value
+
+def make_tables(df_clean, df_orders):
     """
     Generate summary tables for dashboard / 为仪表盘生成汇总表
     Returns a dict with tables for KPIs, time trends, regions etc.
+    Order counts come from the order table (one row per order), not from
+    distinct counts over line items.
     """
     tables = {}
 
     #  KPI 总览
     tables["kpi"] = {
-        "total_sales": df_clean["SALES"].sum(),
-        "total_quantity": df_clean["QUANTITYORDERED"].sum(),
-        "avg_price": df_clean["PRICEEACH"].mean()
+        "total_sales": df_orders["SALES"].sum(),
+        "total_quantity": df_orders["QUANTITYORDERED"].sum(),
+        "avg_price": df_clean["PRICEEACH"].mean(),
+        **order_kpis(df_orders),
     }
 
-    
-
     # 按月份汇总 / Sales by month
-    df_time = df_clean.groupby(df_clean["ORDERDATE"].dt.to_period("M")).agg({
-        "SALES": "sum",
-        "QUANTITYORDERED": "sum",
-        "ORDERNUMBER": "nunique"        
-    }).reset_index()
+    df_time = df_orders.groupby(df_orders["ORDERDATE"].dt.to_period("M")).agg(
+        SALES=("SALES", "sum"),
+        QUANTITYORDERED=("QUANTITYORDERED", "sum"),
+        ORDERNUMBER=("SALES", "size"),
+    ).reset_index()
     df_time["ORDERDATE"] = df_time["ORDERDATE"].dt.to_timestamp()  # 转回 Timestamp，方便绘图
     tables["timeseries"] = df_time
 
     #  按国家汇总 / Sales by country
-    df_region = df_clean.groupby("COUNTRY").agg({
-        "SALES": "sum",
-        "ORDERNUMBER": "nunique"
-    }).reset_index()
+    df_region = df_orders.groupby("COUNTRY").agg(
+        SALES=("SALES", "sum"),
+        ORDERNUMBER=("SALES", "size"),
+    ).reset_index()
     tables["by_region"] = df_region
 
     return tables
+
+
+def make_treemap_hierarchy(df_clean):
+    """
+    Precompute treemap aggregates per level / 预计算树状图各层级汇总
+    Leaf totals are grouped once and rolled up to the upper levels.
+    """
+    measures = ["SALES", "QUANTITYORDERED"]
+    df_code = df_clean.groupby(["COUNTRY", "PRODUCTLINE", "PRODUCTCODE"])[measures].sum()
+    df_line = df_code.groupby(level=["COUNTRY", "PRODUCTLINE"]).sum()
+    df_country = df_line.groupby(level="COUNTRY").sum()
+    return {
+        "COUNTRY": df_country,
+        "PRODUCTLINE": df_line,
+        "PRODUCTCODE": df_code,
+    }
+
+
+def make_retention_matrix(df_clean, df_customers):
+    """
+    Customer cohort retention matrix / 客户留存矩阵
+    Rows are first-order months, columns are months since the first order.
+    Cohorts come from the customer table; line items only supply the
+    distinct (customer, active month) pairs.
+    """
+    df_active = pd.DataFrame({
+        "CUSTOMERNAME": df_clean["CUSTOMERNAME"],
+        "MONTH": df_clean["ORDERDATE"].dt.to_period("M"),
+    }).drop_duplicates()
+    first_month = df_active["CUSTOMERNAME"].map(df_customers["COHORT"])
+    cohort_index = (
+        (df_active["MONTH"].dt.year - first_month.dt.year) * 12 +
+        (df_active["MONTH"].dt.month - first_month.dt.month)
+    )
+
+    # 每个队列每月的活跃客户数 / Active customers per cohort and month offset
+    cohort_pivot = cohort_index.groupby(
+        [first_month.astype(str).rename("FIRST_MONTH"), cohort_index.rename("COHORT_INDEX")]
+    ).size().unstack(fill_value=0)
+
+    cohort_size = cohort_pivot.iloc[:, 0]
+    return cohort_pivot.divide(cohort_size, axis=0)
+
+
+def make_country_clusters(df_clean, n_clusters=4, linkage_method="ward"):
+    """
+    Country x product line share matrix and hierarchical clustering / 国家聚类
+    linkage is None when the countries cannot form n_clusters distinct clusters
+    (too few countries, or filters that leave identical product mixes).
+    """
+    from scipy.cluster.hierarchy import linkage, fcluster, dendrogram
+
+    # 各国产品线销售占比 / Sales share by product line for each country
+    df_features = df_clean.groupby(["COUNTRY", "PRODUCTLINE"])["SALES"].sum().unstack(fill_value=0)
+    df_features_pct = df_features.div(df_features.sum(axis=1), axis=0)
+    result = {"features": df_features, "features_pct": df_features_pct,
+              "linkage": None, "clusters": None, "dendro_order": None}
+    if df_features_pct.shape[0] < n_clusters:
+        return result
+
+    Z = linkage(df_features_pct, method=linkage_method)
+    clusters = fcluster(Z, t=n_clusters, criterion="maxclust")
+    if len(np.unique(clusters)) < n_clusters:
+        return result
+    result["linkage"] = Z
+    result["clusters"] = clusters
+    result["dendro_order"] = dendrogram(Z, labels=df_features_pct.index, no_plot=True)["ivl"]
+    return result
@@ -0,0 +1,266 @@
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+# 草图参数 / Sketch sizes
+HLL_P = 12          # 4096 registers, ~1.6% standard error on distinct counts
+KLL_K = 200         # ~1.3% normalized rank error on quantiles
+TOP_K = 1024        # counters kept when merging chunks; only the top value is shown
+QUANTILES = [0.25, 0.5, 0.75]
+
+
+# -------------------------
+# HyperLogLog: distinct counts / 去重计数
+# -------------------------
+def hll_sketch(values, p=HLL_P):
+    """
+    HyperLogLog registers for a batch of values / 批量构建 HLL 寄存器
+    """
+    registers = np.zeros(1 << p, dtype=np.uint8)
+    values = pd.Series(values).dropna().to_numpy()
+    if len(values) == 0:
+        return registers
+
+    hashes = pd.util.hash_array(values, categorize=False)
+    idx = (hashes >> np.uint64(64 - p)).astype(np.intp)
+    rest = hashes << np.uint64(p)
+    rank = np.minimum(64 - _bit_length64(rest) + 1, 64 - p + 1).astype(np.uint8)
+    np.maximum.at(registers, idx, rank)
+    return registers
+
+
+def hll_merge(a, b):
+    return np.maximum(a, b)
+
+
+def hll_estimate(registers):
+    """
+    Estimated distinct count with small-range correction / 去重计数估计
+    """
+    m = len(registers)
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / np.sum(np.ldexp(1.0, -registers.astype(int)))
+    zeros = int((registers == 0).sum())
+    if estimate <= 2.5 * m and zeros:
+        estimate = m * np.log(m / zeros)
+    return estimate
+
+
+def hll_error(registers):
+    """Relative standard error of the estimate"""
+    return 1.04 / np.sqrt(len(registers))
+
+
+def _bit_length64(x):
+    """Bit length of uint64 values, split into exact 32-bit halves"""
+    hi = (x >> np.uint64(32)).astype(np.float64)
+    lo = (x & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    with np.errstate(divide="ignore"):
+        bits_hi = np.floor(np.log2(hi)) + 33
+        bits_lo = np.floor(np.log2(lo)) + 1
+    return np.where(hi > 0, bits_hi, np.where(lo > 0, bits_lo, 0)).astype(np.int64)
+
+
+# -------------------------
+# KLL: quantiles / 分位数
+# -------------------------
+def kll_sketch(values, k=KLL_K):
+    """
+    KLL quantile sketch for a batch of numbers / 批量构建 KLL 分位数草图
+    """
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    sketch = {"k": k, "n": len(values), "levels": [values]}
+    return _kll_compress(sketch)
+
+
+def kll_merge(a, b):
+    height = max(len(a["levels"]), len(b["levels"]))
+    levels = [
+        np.concatenate([a["levels"][h] if h < len(a["levels"]) else np.empty(0),
+                        b["levels"][h] if h < len(b["levels"]) else np.empty(0)])
+        for h in range(height)
+    ]
+    return _kll_compress({"k": a["k"], "n": a["n"] + b["n"], "levels": levels})
+
+
+def kll_quantiles(sketch, qs=QUANTILES):
+    """
+    Approximate quantiles from the weighted sketch items / 由草图估计分位数
+    """
+    if sketch["n"] == 0:
+        return [np.nan] * len(qs)
+    items = np.concatenate(sketch["levels"])
+    weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(sketch["levels"])])
+    order = np.argsort(items, kind="stable")
+    cum = np.cumsum(weights[order])
+    pos = np.searchsorted(cum, np.asarray(qs) * cum[-1], side="left")
+    return items[order][np.minimum(pos, len(items) - 1)].tolist()
+
+
+def kll_error(sketch):
+    """Normalized rank error of a KLL sketch with parameter k"""
+    return 2.296 / sketch["k"] ** 0.9723
+
+
+def _kll_capacity(k, height, level):
+    return max(2, int(np.ceil(k * (2 / 3) ** (height - level - 1))))
+
+
+def _kll_compress(sketch):
+    """Compact over-full levels, promoting every other sorted item"""
+    rng = np.random.default_rng(sketch["n"])
+    levels = list(sketch["levels"])
+    changed = True
+    while changed:
+        changed = False
+        for h in range(len(levels)):
+            if len(levels[h]) <= _kll_capacity(sketch["k"], len(levels), h):
+                continue
+            items = np.sort(levels[h])
+            leftover, items = items[len(items) - len(items) % 2:], items[:len(items) - len(items) % 2]
+            if h + 1 == len(levels):
+                levels.append(np.empty(0))
+            levels[h] = leftover
+            levels[h + 1] = np.concatenate([levels[h + 1], items[rng.integers(2)::2]])
+            changed = True
+    return {**sketch, "levels": levels}
+
+
+# -------------------------
+# Misra-Gries: heavy hitters / 高频值
+# -------------------------
+def top_sketch(values, k=TOP_K):
+    """
+    Misra-Gries summary of the most frequent values / 高频值摘要
+    A single chunk keeps its exact counts (at most one counter per row);
+    counters are trimmed to k only when chunks are merged.
+    """
+    counts = pd.Series(values).value_counts()
+    return {"k": k, "n": int(counts.sum()), "error": 0, "counts": counts}
+
+
+def top_merge(a, b):
+    counts = a["counts"].add(b["counts"], fill_value=0)
+    return _top_trim({"k": a["k"], "n": a["n"] + b["n"], "error": a["error"] + b["error"], "counts": counts})
+
+
+def _top_trim(sketch):
+    """Keep at most k counters; every count is low by at most sketch["error"]"""
+    counts = sketch["counts"]
+    if len(counts) <= sketch["k"]:
+        return sketch
+    threshold = counts.nlargest(sketch["k"] + 1).iloc[-1]
+    counts = counts - threshold
+    return {**sketch, "error": sketch["error"] + int(threshold), "counts": counts[counts > 0]}
+
+
+# -------------------------
+# Column profiles / 列画像
+# -------------------------
+def profile_frame(df, chunk_rows=None):
+    """
+    Mergeable per-column profile of a DataFrame / 可合并的逐列数据画像
+    With chunk_rows set, the frame is profiled slice by slice and merged.
+    """
+    if chunk_rows is None or len(df) <= chunk_rows:
+        return _profile_chunk(df)
+    return profile_chunks(df.iloc[start:start + chunk_rows] for start in range(0, len(df), chunk_rows))
+
+
+def profile_chunks(chunks):
+    """
+    Profile an iterable of chunks, e.g. pd.read_csv(..., chunksize=...) / 分块画像
+    """
+    return reduce(merge_profiles, (_profile_chunk(chunk) for chunk in chunks))
+
+
+def merge_profiles(a, b):
+    columns = {}
+    for col, entry in a["columns"].items():
+        other = b["columns"][col]
+        merged = {"kind": entry["kind"], "count": entry["count"] + other["count"],
+                  "missing": entry["missing"] + other["missing"]}
+        if entry["kind"] == "numeric":
+            merged["moments"] = _moments_merge(entry["moments"], other["moments"])
+            merged["quantiles"] = kll_merge(entry["quantiles"], other["quantiles"])
+        else:
+            merged["distinct"] = hll_merge(entry["distinct"], other["distinct"])
+            merged["top"] = top_merge(entry["top"], other["top"])
+        columns[col] = merged
+    return {"n_rows": a["n_rows"] + b["n_rows"], "columns": columns}
+
+
+def profile_summary(profile):
+    """
+    Numerical and categorical summary tables with error bounds / 带误差范围的汇总表
+    """
+    numeric_rows, categorical_rows = {}, {}
+    for col, entry in profile["columns"].items():
+        if entry["kind"] == "numeric":
+            moments = entry["moments"]
+            q25, q50, q75 = kll_quantiles(entry["quantiles"])
+            numeric_rows[col] = {
+                "count": entry["count"],
+                "missing": entry["missing"],
+                "mean": moments["mean"],
+                "std": np.sqrt(moments["m2"] / (moments["n"] - 1)) if moments["n"] > 1 else np.nan,
+                "min": moments["min"],
+                "25%": q25,
+                "50%": q50,
+                "75%": q75,
+                "max": moments["max"],
+                "quantile rank error ±": kll_error(entry["quantiles"]),
+            }
+        else:
+            counts = entry["top"]["counts"]
+            unique = hll_estimate(entry["distinct"])
+            categorical_rows[col] = {
+                "count": entry["count"],
+                "missing": entry["missing"],
+                "unique (≈)": round(unique),
+                "unique error ±": round(unique * hll_error(entry["distinct"])),
+                "top": str(counts.idxmax()) if len(counts) else None,
+                "freq (≥)": int(counts.max()) if len(counts) else 0,
+                "freq error ≤": entry["top"]["error"],
+            }
+    return pd.DataFrame.from_dict(numeric_rows, orient="index"), pd.DataFrame.from_dict(categorical_rows, orient="index")
+
+
+def _profile_chunk(df):
+    columns = {}
+    for col in df.columns:
+        s = df[col]
+        missing = int(s.isna().sum())
+        entry = {"count": len(s) - missing, "missing": missing}
+        if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+            values = s.to_numpy(dtype=float)
+            entry.update(kind="numeric", moments=_moments(values), quantiles=kll_sketch(values))
+        else:
+            entry.update(kind="categorical", distinct=hll_sketch(s), top=top_sketch(s))
+        columns[col] = entry
+    return {"n_rows": len(df), "columns": columns}
+
+
+def _moments(values):
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return {"n": 0, "mean": 0.0, "m2": 0.0, "min": np.nan, "max": np.nan}
+    mean = values.mean()
+    return {"n": len(values), "mean": mean, "m2": float(((values - mean) ** 2).sum()),
+            "min": values.min(), "max": values.max()}
+
+
+def _moments_merge(a, b):
+    n = a["n"] + b["n"]
+    if n == 0:
+        return a
+    delta = b["mean"] - a["mean"]
+    return {
+        "n": n,
+        "mean": a["mean"] + delta * b["n"] / n,
+        "m2": a["m2"] + b["m2"] + delta * delta * a["n"] * b["n"] / n,
+        "min": np.fmin(a["min"], b["min"]),
+        "max": np.fmax(a["max"], b["max"]),
+    }
@@ -0,0 +1,133 @@
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+# 参与相关性分析的业务指标（不含订单号等标识列）/ Curated measures, identifiers excluded
+MEASURES = ["QUANTITYORDERED", "PRICEEACH", "SALES", "MSRP", "DAYS_SINCE_LASTORDER"]
+SEGMENT_COLUMNS = ["PRODUCTLINE", "COUNTRY", "DEALSIZE"]
+
+
+def compute_moments(df, by=SEGMENT_COLUMNS, measures=MEASURES):
+    """
+    Running means and co-moments per segment / 按分组计算均值与协矩
+    Returns a mergeable state dict: keys, counts n, means (k, m) and
+    centred co-moments (k, m, m). Rows with a missing measure are skipped.
+    """
+    X = df[measures].to_numpy(dtype=float)
+    valid = ~np.isnan(X).any(axis=1) & df[list(by)].notna().all(axis=1).to_numpy()
+    X = X[valid]
+    df_keys = df.loc[valid, list(by)]
+
+    codes, keys = _segment_codes(df_keys, by)
+    k, m = len(keys), len(measures)
+
+    n = np.bincount(codes, minlength=k).astype(float)
+    sums = np.column_stack([np.bincount(codes, weights=X[:, i], minlength=k) for i in range(m)])
+    mean = sums / np.maximum(n, 1)[:, np.newaxis]
+
+    # 以组均值中心化后累加外积 / Sum outer products of centred rows
+    Xc = X - mean[codes]
+    comoment = np.empty((k, m, m))
+    for i in range(m):
+        for j in range(i, m):
+            comoment[:, i, j] = comoment[:, j, i] = np.bincount(codes, weights=Xc[:, i] * Xc[:, j], minlength=k)
+
+    return {"by": list(by), "measures": list(measures), "keys": keys, "n": n, "mean": mean, "comoment": comoment}
+
+
+def merge_moments(a, b):
+    """
+    Merge two moment states (Chan et al. parallel update) / 合并两个分块的统计量
+    Segments present in only one side are carried over unchanged.
+    """
+    keys = a["keys"].union(b["keys"])
+    n, mean, comoment = _empty_like(a, len(keys))
+    ia = keys.get_indexer(a["keys"])
+    ib = keys.get_indexer(b["keys"])
+
+    n[ia], mean[ia], comoment[ia] = a["n"], a["mean"], a["comoment"]
+
+    n_a, n_b = n[ib], b["n"]
+    n_ab = n_a + n_b
+    delta = b["mean"] - mean[ib]
+    weight = np.divide(n_b, n_ab, out=np.zeros_like(n_ab), where=n_ab > 0)
+    comoment[ib] += b["comoment"] + np.einsum("ki,kj->kij", delta, delta) * (n_a * weight)[:, np.newaxis, np.newaxis]
+    mean[ib] += delta * weight[:, np.newaxis]
+    n[ib] = n_ab
+
+    return {**a, "keys": keys, "n": n, "mean": mean, "comoment": comoment}
+
+
+def update_moments(state, df_new):
+    """
+    Fold newly appended rows into an existing state / 增量更新统计量
+    """
+    return merge_moments(state, compute_moments(df_new, state["by"], state["measures"]))
+
+
+def moments_from_chunks(chunks, by=SEGMENT_COLUMNS, measures=MEASURES):
+    """
+    Build a state from an iterable of DataFrame chunks / 分块流式计算统计量
+    """
+    return reduce(merge_moments, (compute_moments(chunk, by, measures) for chunk in chunks))
+
+
+def rollup_moments(state, by):
+    """
+    Roll a fine-grained state up to coarser segments / 将细粒度统计量汇总到粗粒度
+    by=[] collapses everything into a single "All" segment.
+    """
+    df_keys = state["keys"].to_frame(index=False)[list(by)] if by else pd.DataFrame(index=range(len(state["keys"])))
+    codes, keys = _segment_codes(df_keys, by)
+    n, mean, comoment = _empty_like(state, len(keys))
+
+    np.add.at(n, codes, state["n"])
+    np.add.at(mean, codes, state["mean"] * state["n"][:, np.newaxis])
+    mean /= np.maximum(n, 1)[:, np.newaxis]
+
+    # 组内协矩 + 组间均值偏移 / Within-segment co-moments plus between-segment shift
+    delta = state["mean"] - mean[codes]
+    np.add.at(comoment, codes, state["comoment"] + np.einsum("ki,kj->kij", delta, delta) * state["n"][:, np.newaxis, np.newaxis])
+
+    return {**state, "by": list(by), "keys": keys, "n": n, "mean": mean, "comoment": comoment}
+
+
+def build_segment_stats(df, segments=SEGMENT_COLUMNS, measures=MEASURES):
+    """
+    Compute every segmented view from one pass over the rows / 一次扫描得到所有分组视图
+    Returns a dict segment column -> state, with None for the overall view.
+    """
+    fine = compute_moments(df, segments, measures)
+    stats = {col: rollup_moments(fine, [col]) for col in segments}
+    stats[None] = rollup_moments(fine, [])
+    return stats
+
+
+def correlation_matrix(state, key="All"):
+    """
+    Pearson correlation matrix for one segment / 某一分组的相关系数矩阵
+    """
+    pos = state["keys"].get_loc(key)
+    comoment = state["comoment"][pos]
+    std = np.sqrt(np.diag(comoment))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = comoment / np.outer(std, std)
+    return pd.DataFrame(corr, index=state["measures"], columns=state["measures"])
+
+
+def _segment_codes(df_keys, by):
+    """Integer segment code per row and the sorted segment keys"""
+    if not by:
+        return np.zeros(len(df_keys), dtype=np.intp), pd.Index(["All"])
+    if len(by) == 1:
+        codes, keys = pd.factorize(df_keys[by[0]], sort=True)
+        return codes, pd.Index(keys, name=by[0])
+    keys = pd.MultiIndex.from_frame(df_keys[list(by)])
+    codes, uniques = keys.factorize(sort=True)
+    return codes, pd.MultiIndex.from_tuples(uniques, names=list(by))
+
+
+def _empty_like(state, k):
+    m = len(state["measures"])
+    return np.zeros(k), np.zeros((k, m)), np.zeros((k, m, m))
@@ -0,0 +1,124 @@
+"""
+Server-side paginated table viewer / 服务端分页表格
+
+Filtering, sorting and paging run on the server with vectorized pandas /
+NumPy operations, and only the visible page is sent to the browser. Numbers
+are formatted through st.column_config in the browser, not through Styler.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+PAGE_SIZES = [25, 50, 100, 500]
+COMPARISON = re.compile(r"^\s*(>=|<=|!=|>|<|=)?\s*(-?(?:\d+\.?\d*|\.\d+)(?:e[-+]?\d+)?)\s*$", re.IGNORECASE)
+NUMERIC_OPS = {
+    ">=": np.greater_equal, "<=": np.less_equal, "!=": np.not_equal,
+    ">": np.greater, "<": np.less, "=": np.equal,
+}
+
+
+def column_formats(df, formats):
+    """
+    st.column_config for per-column number formats / 列格式配置（替代 Styler）
+    formats maps a column name to a NumberColumn format, e.g. "percent", "dollar" or "%.2f".
+    """
+    return {col: st.column_config.NumberColumn(format=fmt) for col, fmt in formats.items() if col in df.columns}
+
+
+def filter_mask(series, query):
+    """
+    Boolean mask for a filter query on one column / 单列筛选条件
+    Numeric columns take a comparison such as ">= 100"; other columns match
+    a case-insensitive substring. An unparsable numeric query matches nothing.
+    """
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        match = COMPARISON.match(query)
+        if not match:
+            return np.zeros(len(series), dtype=bool)
+        op = NUMERIC_OPS[match.group(1) or "="]
+        return op(series.to_numpy(dtype=float), float(match.group(2)))
+    return series.astype(str).str.contains(query, case=False, regex=False).to_numpy()
+
+
+def sorted_positions(values, stop, ascending=True):
+    """
+    Positions of the first `stop` rows in sort order / 排序后前 stop 行的位置
+    Early pages only partially sort via argpartition; NaNs always go last.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in "mM":
+        values = np.where(np.isnat(values), np.nan, values.view(np.int64).astype(float))
+    elif values.dtype.kind not in "iubfc":
+        # 文本列按排序后的编码比较 / Text columns compare by sorted factorize codes
+        try:
+            codes, _ = pd.factorize(values, sort=True)
+        except TypeError:
+            codes, _ = pd.factorize(values.astype(str), sort=True)
+        values = np.where(codes < 0, np.nan, codes)
+
+    if values.dtype.kind in "fc":
+        keys = values if ascending else -values
+        keys = np.where(np.isnan(keys), np.inf, keys)
+    else:
+        keys = values if ascending else -values.astype(np.int64)
+
+    if stop >= len(keys) // 2:
+        return np.argsort(keys, kind="stable")[:stop]
+    head = np.argpartition(keys, stop - 1)[:stop]
+    return head[np.argsort(keys[head], kind="stable")]
+
+
+def filter_positions(df, filter_by=None, query=""):
+    """
+    Row positions matching a filter, or None when unfiltered / 筛选后的行位置
+    """
+    if filter_by is None or not query:
+        return None
+    return np.flatnonzero(filter_mask(df[filter_by], query))
+
+
+def page_table(df, page=0, page_size=PAGE_SIZES[0], sort_by=None, ascending=True, positions=None):
+    """
+    Sort and slice one page of a (filtered) table / 排序并截取一页
+    positions comes from filter_positions. Returns (page frame, number of matching rows).
+    """
+    n_rows = len(df) if positions is None else len(positions)
+
+    start, stop = page * page_size, min((page + 1) * page_size, n_rows)
+    if sort_by is not None:
+        column = df[sort_by] if sort_by in df.columns else df.index.get_level_values(sort_by)
+        values = column.to_numpy() if positions is None else column.to_numpy()[positions]
+        order = sorted_positions(values, stop, ascending)[start:stop]
+        rows = order if positions is None else positions[order]
+    else:
+        rows = np.arange(start, stop) if positions is None else positions[start:stop]
+    return df.take(rows), n_rows
+
+
+def table_viewer(df, key, formats=None, page_size=PAGE_SIZES[0], height="auto"):
+    """
+    Paginated table widget with server-side filter and sort / 分页表格控件
+    """
+    sortable = ([df.index.name] if df.index.name else []) + list(df.columns)
+    c_filter, c_query, c_sort, c_order, c_size = st.columns([2, 2, 2, 1, 1])
+    filter_by = c_filter.selectbox("Filter column", list(df.columns), key=f"{key}_filter_by")
+    query = c_query.text_input("Filter", key=f"{key}_query", placeholder="text, or >= 100 for numbers")
+    sort_by = c_sort.selectbox("Sort by", ["(none)"] + sortable, key=f"{key}_sort_by")
+    ascending = c_order.selectbox("Order", ["Asc", "Desc"], key=f"{key}_order") == "Asc"
+    size = c_size.selectbox("Rows", PAGE_SIZES, index=PAGE_SIZES.index(page_size) if page_size in PAGE_SIZES else 0,
+                            key=f"{key}_page_size")
+
+    positions = filter_positions(df, filter_by, query)
+    n_rows = len(df) if positions is None else len(positions)
+    n_pages = max(1, -(-n_rows // size))
+    page = st.number_input(f"Page (of {n_pages:,})", min_value=1, max_value=n_pages, value=1, step=1,
+                           key=f"{key}_page_{n_pages}") - 1
+
+    df_page, n_rows = page_table(df, page, size, None if sort_by == "(none)" else sort_by, ascending, positions)
+    st.dataframe(df_page, column_config=column_formats(df_page, formats or {}),
+                 use_container_width=True, height=height)
+    first = page * size + 1 if n_rows else 0
+    st.caption(f"Rows {first:,}–{page * size + len(df_page):,} of {n_rows:,}"
+               + (f" (filtered from {len(df):,})" if query else ""))
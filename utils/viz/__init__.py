@@ -0,0 +1,37 @@
+"""
+Visualization components, split per plotting backend / 按绘图后端拆分的可视化组件
+
+Backends are imported lazily on first use, so pages that only need Altair or
+Plotly never pay for importing matplotlib, seaborn or scipy.
+"""
+import importlib
+
+_BACKENDS = {
+    "altair_charts": [
+        "line_chart", "bar_chart", "line_chart_au_fr", "forecast_chart", "heatmap_sales", "scatter_price_msrp",
+        "whatif_trend_chart", "whatif_country_chart",
+    ],
+    "plotly_charts": [
+        "show_all_country_pies", "scatter_price", "choropleth_sales", "sales_treemap",
+        "customer_retention_heatmap", "rfm_segment_chart", "product_sales_funnel", "product_affinity_heatmap", "correlation_heatmap",
+        "cluster_radar_chart", "cluster_distribution_pie",
+    ],
+    "mpl_charts": [
+        "cluster_dendrogram", "cluster_heatmap",
+    ],
+}
+_LOCATIONS = {name: module for module, names in _BACKENDS.items() for name in names}
+
+__all__ = list(_LOCATIONS)
+
+
+def __getattr__(name):
+    if name not in _LOCATIONS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{_LOCATIONS[name]}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,164 @@
+import streamlit as st
+import altair as alt
+import pandas as pd
+
+
+def line_chart(df):
+    """
+    Draw line chart with sales and quantity / 折线图（双轴）
+    """
+    base = alt.Chart(df).encode(x='ORDERDATE:T')
+
+    # 销售额折线
+    line_sales = base.mark_line(color='blue').encode(
+        y=alt.Y('SALES:Q', axis=alt.Axis(title='Sales ($)', titleColor='blue'))
+    )
+
+    # 销售量折线
+    line_qty = base.mark_line(color='orange').encode(
+        y=alt.Y('QUANTITYORDERED:Q', axis=alt.Axis(title='Quantity', titleColor='orange'))
+    )
+
+    chart = alt.layer(line_sales, line_qty).resolve_scale(y='independent').interactive()
+    st.altair_chart(chart, use_container_width=True)
+
+
+def bar_chart(df):
+    """
+    Draw bar chart with sales by country / 条形图
+    """
+    df_melt = df.melt(
+        id_vars=['COUNTRY'],
+        value_vars=['SALES'],
+        var_name='Metric',
+        value_name='Value'
+    )
+
+    chart = alt.Chart(df_melt).mark_bar().encode(
+        x=alt.X('COUNTRY:N', title='Country'),
+        y=alt.Y('Value:Q', title='Sales ($)'),
+        color=alt.Color('Metric:N', title='Metric', scale=alt.Scale(range=['blue'])),
+        tooltip=['COUNTRY', 'Metric', 'Value']
+    ).interactive()
+
+    st.altair_chart(chart, use_container_width=True)
+
+
+# -------------------------
+# Line chart: Australia vs France
+# -------------------------
+def line_chart_au_fr(df_metrics, df_forecast=None):
+    df_monthly = df_metrics[df_metrics["COUNTRY"].isin(["Australia", "France"])]
+    df_monthly = df_monthly[["ORDERDATE", "COUNTRY", "SALES"]].rename(columns={"ORDERDATE": "ORDER_MONTH"})
+    chart = alt.Chart(df_monthly).mark_line(point=True).encode(
+        x="ORDER_MONTH:T",
+        y="SALES:Q",
+        color="COUNTRY:N",
+        tooltip=["ORDER_MONTH:T", "SALES:Q", "COUNTRY:N"]
+    )
+
+    # 叠加预测（虚线）/ Overlay forecasts as dashed lines
+    if df_forecast is not None:
+        df_fc = df_forecast[(df_forecast["KIND"] == "forecast") & df_forecast["COUNTRY"].isin(["Australia", "France"])]
+        df_fc = df_fc.groupby(["ORDERDATE", "COUNTRY"]).agg({"SALES": "sum"}).reset_index()
+        df_fc = df_fc.rename(columns={"ORDERDATE": "ORDER_MONTH"})
+        chart = chart + alt.Chart(df_fc).mark_line(point=True, strokeDash=[6, 4]).encode(
+            x="ORDER_MONTH:T",
+            y="SALES:Q",
+            color="COUNTRY:N",
+            tooltip=["ORDER_MONTH:T", "SALES:Q", "COUNTRY:N"]
+        )
+    return chart.interactive().properties(width=700, height=400)
+
+# -------------------------
+# Forecast: history vs forecast
+# -------------------------
+def forecast_chart(df_forecast, title="Sales History and Forecast"):
+    df_total = df_forecast.groupby(["ORDERDATE", "KIND"]).agg({"SALES": "sum"}).reset_index()
+    chart = alt.Chart(df_total).mark_line(point=True).encode(
+        x=alt.X("ORDERDATE:T", title="Month"),
+        y=alt.Y("SALES:Q", title="Sales ($)"),
+        color=alt.Color("KIND:N", title="", scale=alt.Scale(domain=["history", "forecast"], range=["blue", "orange"])),
+        strokeDash=alt.StrokeDash("KIND:N", legend=None, scale=alt.Scale(domain=["history", "forecast"], range=[[1, 0], [6, 4]])),
+        tooltip=["ORDERDATE:T", "KIND:N", alt.Tooltip("SALES:Q", format=",.0f")]
+    ).interactive().properties(title=title, height=350)
+    return chart
+
+# -------------------------
+# What-if pricing: base vs scenario
+# -------------------------
+def whatif_trend_chart(df_monthly, title="Monthly Sales: Base vs Scenario"):
+    df_long = df_monthly.melt(id_vars=["ORDERDATE"], value_vars=["BASE", "SCENARIO"], var_name="KIND", value_name="SALES")
+    chart = alt.Chart(df_long).mark_line(point=True).encode(
+        x=alt.X("ORDERDATE:T", title="Month"),
+        y=alt.Y("SALES:Q", title="Sales ($)"),
+        color=alt.Color("KIND:N", title="", scale=alt.Scale(domain=["BASE", "SCENARIO"], range=["blue", "orange"])),
+        strokeDash=alt.StrokeDash("KIND:N", legend=None, scale=alt.Scale(domain=["BASE", "SCENARIO"], range=[[1, 0], [6, 4]])),
+        tooltip=["ORDERDATE:T", "KIND:N", alt.Tooltip("SALES:Q", format=",.0f")]
+    ).properties(title=title, height=300)
+    return chart
+
+def whatif_country_chart(df_country, title="Sales Change by Country"):
+    chart = alt.Chart(df_country).mark_bar().encode(
+        x=alt.X("COUNTRY:N", title="Country", sort="-y"),
+        y=alt.Y("CHANGE:Q", title="Sales change ($)"),
+        color=alt.condition(alt.datum.CHANGE >= 0, alt.value("green"), alt.value("red")),
+        tooltip=["COUNTRY", alt.Tooltip("BASE:Q", format=",.0f"), alt.Tooltip("SCENARIO:Q", format=",.0f"),
+                 alt.Tooltip("CHANGE:Q", format=",.0f")]
+    ).properties(title=title, height=300)
+    return chart
+
+# -------------------------
+# Heatmaps: Sales metric by dimension and month for a year
+# -------------------------
+def heatmap_sales(df_metrics, year, dim="COUNTRY", metric="SALES", title=None):
+    df_year = df_metrics[df_metrics["YEAR"] == year]
+    if metric.endswith(("_PCT", "_GROWTH")):
+        scale = alt.Scale(scheme="redblue", domainMid=0)
+        value_format = ".1%"
+    else:
+        scale = alt.Scale(scheme="greens")
+        value_format = ",.0f"
+    chart = alt.Chart(df_year).mark_rect().encode(
+        x=alt.X("MONTH:O", title="Month"),
+        y=alt.Y(f"{dim}:N", title=dim.title()),
+        color=alt.Color(f"{metric}:Q", title=title or metric, scale=scale),
+        tooltip=[f"{dim}:N", "MONTH:O", alt.Tooltip(f"{metric}:Q", format=value_format)]
+    ).properties(width=300, height=400, title=f"{title or metric} {year}")
+    return chart
+
+# -------------------------
+# Scatter plot: Price vs MSRP difference
+# -------------------------
+def scatter_price_msrp(df_clean, x_axis, df_scores=None, threshold=None):
+    """
+    Price vs MSRP ratio scatter, with flagged anomalies ringed in red / 售价偏离散点图（异常点红圈标出）
+    df_scores comes from utils.anomaly.detect_price_anomalies; with a threshold,
+    lines with |ROBUST_Z| >= threshold are ringed instead of the IS_ANOMALY flags.
+    """
+    columns = list(dict.fromkeys([x_axis, "PRICEEACH", "MSRP", "PRODUCTLINE", "PRODUCTCODE"]))
+    df_plot = df_clean[columns]
+    if x_axis == "ORDERDATE":
+        df_plot = df_plot.assign(MONTH=pd.to_datetime(df_plot["ORDERDATE"], dayfirst=True).dt.to_period("M").astype(str))
+        x_axis = "MONTH"
+    if df_scores is None:
+        df_plot = df_plot.assign(PRICE_DIFF_RATIO=(df_plot["PRICEEACH"] - df_plot["MSRP"]) / df_plot["MSRP"])
+    else:
+        flagged = df_scores["IS_ANOMALY"] if threshold is None else df_scores["ROBUST_Z"].abs() >= threshold
+        df_plot = df_plot.assign(PRICE_DIFF_RATIO=df_scores["PRICE_DIFF_RATIO"], ROBUST_Z=df_scores["ROBUST_Z"].round(1),
+                                 IS_ANOMALY=flagged)
+    chart = alt.Chart(df_plot).mark_circle(size=60, opacity=0.6).encode(
+        x=alt.X(f"{x_axis}:Q", title=x_axis),
+        y=alt.Y("PRICE_DIFF_RATIO:Q", title="Price vs MSRP Ratio"),
+        color="PRODUCTLINE:N",
+        tooltip=[x_axis, "PRICEEACH", "MSRP", "PRICE_DIFF_RATIO", "PRODUCTLINE"]
+    )
+    if df_scores is not None:
+        # 异常点叠加层 / Overlay ring on flagged lines
+        outliers = alt.Chart(df_plot[df_plot["IS_ANOMALY"]]).mark_point(size=140, color="red", strokeWidth=2).encode(
+            x=alt.X(f"{x_axis}:Q"),
+            y=alt.Y("PRICE_DIFF_RATIO:Q"),
+            tooltip=[x_axis, "PRODUCTCODE", "PRICEEACH", "MSRP", "PRICE_DIFF_RATIO", "ROBUST_Z"]
+        )
+        chart = chart + outliers
+    return chart.interactive().properties(width=700, height=400)
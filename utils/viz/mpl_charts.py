@@ -0,0 +1,34 @@
+import matplotlib.pyplot as plt
+import seaborn as sns
+from scipy.cluster.hierarchy import dendrogram
+
+def cluster_dendrogram(df_features_pct, Z):
+    """绘制层次聚类树状图"""
+    plt.figure(figsize=(10, 8))
+    dendrogram(Z, labels=df_features_pct.index, leaf_font_size=10, orientation='left')
+    plt.title("Hierarchical Clustering Dendrogram")
+    plt.xlabel("Distance")
+    plt.ylabel("Country")
+    
+    return plt.gcf()
+
+def cluster_heatmap(df_features_with_cluster, dendro_order):
+    """绘制聚类热力图"""
+    # Order by dendrogram
+    df_features_ordered = df_features_with_cluster.loc[dendro_order]
+    
+    plt.figure(figsize=(14, 10))
+    sns.heatmap(
+        df_features_ordered.iloc[:, :-2],  # Exclude cluster and Total_Sales columns
+        annot=True,
+        fmt=".1%",
+        cmap="YlGnBu",
+        linewidths=0.5,
+        cbar_kws={'label': 'Sales Percentage'}
+    )
+    plt.title("Product Line Sales Share by Country (Clustered)", fontsize=14)
+    plt.xlabel("Product Line", fontsize=12)
+    plt.ylabel("Country", fontsize=12)
+    plt.xticks(rotation=45)
+    
+    return plt.gcf()
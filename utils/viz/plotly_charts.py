@@ -0,0 +1,235 @@
+import streamlit as st
+import plotly.express as px
+import plotly.graph_objects as go
+import pandas as pd
+
+def show_all_country_pies(df):
+    """
+    Draw overall product line pie + per-country product line pies
+    总销售占比 + 每个国家车型占比饼图
+    """
+    st.subheader("Overall Sales by Product Line")
+    df_total = df.groupby("PRODUCTLINE").agg({"SALES": "sum"}).reset_index()
+    fig_total = px.pie(
+        df_total,
+        names="PRODUCTLINE",
+        values="SALES",
+        title="Total Sales Share by Product Line",
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
+    st.plotly_chart(fig_total, use_container_width=True)
+
+    st.subheader("Sales Share by Product Line per Country")
+    countries = df["COUNTRY"].unique()
+    n_cols = 4
+    cols = st.columns(n_cols)
+
+    for i, country in enumerate(countries):
+        df_country = df[df["COUNTRY"] == country]
+        df_country_group = df_country.groupby("PRODUCTLINE").agg({"SALES": "sum"}).reset_index()
+        fig_country = px.pie(
+            df_country_group,
+            names="PRODUCTLINE",
+            values="SALES",
+            title=country,
+            color_discrete_sequence=px.colors.qualitative.Set3
+        )
+        cols[i % n_cols].plotly_chart(fig_country, use_container_width=True)
+        if (i + 1) % n_cols == 0:
+            cols = st.columns(n_cols)
+
+def scatter_price(df, x_axis):
+    """
+    Draw PRICEEACH vs selected X scatter plot / 价格散点图
+    """
+    df_plot = df[list(dict.fromkeys([x_axis, "PRICEEACH", "PRODUCTLINE", "CUSTOMERNAME", "COUNTRY", "ORDERNUMBER"]))]
+    if x_axis == "ORDERDATE":
+        df_plot = df_plot.assign(MONTH=pd.to_datetime(df_plot["ORDERDATE"], dayfirst=True).dt.to_period("M").astype(str))
+        x_axis = "MONTH"
+
+    fig = px.scatter(
+        df_plot,
+        x=x_axis,
+        y="PRICEEACH",
+        color="PRODUCTLINE",
+        hover_data=["CUSTOMERNAME", "COUNTRY", "ORDERNUMBER"],
+        title=f"PRICEEACH vs {x_axis}",
+        labels={"PRICEEACH": "Price Each ($)", x_axis: x_axis},
+        template="plotly_white"
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+
+# -------------------------
+# Choropleth: Sales quantity map by month
+# -------------------------
+def choropleth_sales(df_clean, selected_month):
+    # 不在传入的表上加列 / Do not add columns to the caller's frame
+    df_month = df_clean[df_clean["ORDERDATE"].dt.to_period("M").astype(str) == selected_month]
+    df_country_qty = df_month.groupby("COUNTRY").agg({"QUANTITYORDERED": "sum"}).reset_index()
+    fig = px.choropleth(
+        df_country_qty,
+        locations="COUNTRY",
+        locationmode="country names",
+        color="QUANTITYORDERED",
+        hover_name="COUNTRY",
+        color_continuous_scale="Blues",
+        title=f"Sales Quantity by Country ({selected_month})"
+    )
+    return fig
+
+# =========================
+# NEW VISUALIZATIONS 新增可视化
+# =========================
+
+def _group_small_leaves(df_children, top_n):
+    """Keep the top-N children per parent, fold the rest into "Other" """
+    rank = df_children.groupby(level=0)["SALES"].rank(method="first", ascending=False)
+    df_top = df_children[rank <= top_n]
+    df_rest = df_children[rank > top_n].groupby(level=0).sum()
+    if df_rest.empty:
+        return df_top
+    df_rest.index = pd.MultiIndex.from_arrays(
+        [df_rest.index, ["Other"] * len(df_rest)], names=df_children.index.names
+    )
+    return pd.concat([df_top, df_rest])
+
+
+def sales_treemap(hierarchy, country=None, top_n=15):
+    """树状图显示销售层级结构（按需下钻）"""
+    # 顶层：国家 -> 产品线；下钻：某国的产品线 -> 具体产品
+    if country is None:
+        df_parents = hierarchy["COUNTRY"]
+        df_children = hierarchy["PRODUCTLINE"]
+        title = "Sales Hierarchy Treemap (Country → Product Line)"
+    else:
+        df_parents = hierarchy["PRODUCTLINE"].xs(country, level="COUNTRY")
+        df_children = hierarchy["PRODUCTCODE"].xs(country, level="COUNTRY")
+        title = f"Sales Hierarchy Treemap ({country}: Product Line → Product Code)"
+    df_children = _group_small_leaves(df_children, top_n)
+
+    parent_keys = df_children.index.get_level_values(0).astype(str)
+    child_keys = df_children.index.get_level_values(1).astype(str)
+
+    # 父节点取值为 0，由子节点累加（remainder 模式）/ Parents sum their children
+    fig = go.Figure(go.Treemap(
+        ids=df_parents.index.astype(str).tolist() + (parent_keys + "/" + child_keys).tolist(),
+        labels=df_parents.index.astype(str).tolist() + child_keys.tolist(),
+        parents=[""] * len(df_parents) + parent_keys.tolist(),
+        values=[0] * len(df_parents) + df_children["SALES"].tolist(),
+        branchvalues="remainder",
+        marker=dict(
+            colors=df_parents["QUANTITYORDERED"].tolist() + df_children["QUANTITYORDERED"].tolist(),
+            colorscale="Blues",
+            showscale=True,
+            colorbar=dict(title="QUANTITYORDERED"),
+        ),
+        hovertemplate="%{label}<br>SALES=%{value:,.0f}<br>QUANTITYORDERED=%{color:,.0f}<extra></extra>",
+    ))
+    fig.update_layout(title=title, margin=dict(t=50, l=25, r=25, b=25))
+    return fig
+
+def customer_retention_heatmap(retention_matrix):
+    """客户留存热力图"""
+    # 创建热力图
+    fig = px.imshow(
+        retention_matrix,
+        title="Customer Retention Heatmap",
+        color_continuous_scale="Blues",
+        aspect="auto",
+        labels=dict(x="Months Since First Purchase", y="Cohort Month", color="Retention Rate")
+    )
+    
+    return fig
+
+def rfm_segment_chart(segment_summary):
+    """RFM 客户分段：客户数与销售额"""
+    df_plot = segment_summary.reset_index()
+    fig = px.bar(
+        df_plot,
+        x="SEGMENT",
+        y="REVENUE",
+        text="CUSTOMERS",
+        color="AVG_RECENCY_DAYS",
+        color_continuous_scale="Blues_r",
+        title="Revenue by RFM Segment (labels: customers)",
+        labels={"SEGMENT": "Segment", "REVENUE": "Revenue ($)", "AVG_RECENCY_DAYS": "Avg. Recency (days)"},
+    )
+    fig.update_traces(textposition="outside")
+
+    return fig
+
+def product_sales_funnel(df_clean):
+    """产品销售漏斗图"""
+    # 漏斗只用到销售额，不再对订单/客户做去重计数 / Only sales are plotted; no distinct counts needed
+    product_funnel = df_clean.groupby('PRODUCTLINE', as_index=False)['SALES'].sum()
+    
+    # 创建漏斗图
+    fig = px.funnel(
+        product_funnel, 
+        x='SALES', 
+        y='PRODUCTLINE',
+        title="Product Line Sales Funnel",
+        labels={'SALES': 'Total Sales ($)', 'PRODUCTLINE': 'Product Line'}
+    )
+    
+    return fig
+
+def product_affinity_heatmap(lift_matrix, title="Product Line Affinity (Lift)"):
+    """产品线共购提升度热力图（1 = 独立）"""
+    fig = px.imshow(
+        lift_matrix,
+        title=title,
+        color_continuous_scale="RdBu_r",
+        color_continuous_midpoint=1,
+        aspect="auto",
+        text_auto=".2f",
+        labels=dict(x="Product Line", y="Product Line", color="Lift")
+    )
+
+    return fig
+
+def correlation_heatmap(corr_matrix, title="Numerical Variables Correlation Heatmap"):
+    """数值变量相关性热力图（基于预计算的协矩）"""
+    fig = px.imshow(
+        corr_matrix,
+        title=title,
+        color_continuous_scale="RdBu_r",
+        zmin=-1,
+        zmax=1,
+        aspect="auto",
+        text_auto=".2f"
+    )
+    
+    return fig
+
+def cluster_radar_chart(cluster_profile, cluster_id):
+    """绘制聚类雷达图"""
+    categories = cluster_profile.index.tolist() + [cluster_profile.index.tolist()[0]]
+    values = cluster_profile.values.tolist() + [cluster_profile.values.tolist()[0]]
+    
+    fig_radar = go.Figure()
+    fig_radar.add_trace(go.Scatterpolar(
+        r=values,
+        theta=categories,
+        fill='toself',
+        name=f'Cluster {cluster_id}'
+    ))
+    fig_radar.update_layout(
+        polar=dict(radialaxis=dict(visible=True, range=[0, 0.4])),
+        showlegend=False,
+        title=f"Product Preference Profile - Cluster {cluster_id}",
+        height=400
+    )
+    
+    return fig_radar
+
+def cluster_distribution_pie(cluster_df):
+    """绘制聚类分布饼图"""
+    cluster_counts = cluster_df['cluster'].value_counts().sort_index()
+    fig_pie = px.pie(
+        values=cluster_counts.values,
+        names=[f"Cluster {i}" for i in cluster_counts.index],
+        title="Countries per Cluster"
+    )
+    return fig_pie
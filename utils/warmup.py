@@ -0,0 +1,66 @@
+"""
+Background cache warm-up / 后台缓存预热
+
+When the app starts or the data version changes, a daemon thread computes
+the expensive artifacts in page priority order and publishes each one into
+the shared Streamlit cache. Pages call the same cached functions, so they
+reuse a warmed artifact or compute it on demand if warm-up is still behind.
+"""
+import logging
+import threading
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from utils import artifacts
+
+logger = logging.getLogger(__name__)
+
+# 预热顺序：先 Overview，再 Deep Dives，最后 Country Cluster / Priority order
+WARMUP_STEPS = [
+    ("filter index", artifacts.get_filter_index),
+    ("order table", artifacts.get_order_table),
+    ("overview tables", artifacts.get_tables),
+    ("customer table", artifacts.get_customer_table),
+    ("treemap hierarchy", artifacts.get_treemap_hierarchy),
+    ("product affinity", artifacts.get_product_affinity),
+    ("leaderboards", artifacts.get_leaderboards),
+    ("segment statistics", artifacts.get_segment_stats),
+    ("sales forecasts", artifacts.get_forecast_panel),
+    ("period metrics", artifacts.get_period_metrics),
+    ("price anomalies", artifacts.get_price_anomalies),
+    ("price cube", artifacts.get_price_cube),
+    ("retention matrix", artifacts.get_retention_matrix),
+    ("country clusters", artifacts.get_country_clusters),
+]
+
+
+@st.cache_resource(show_spinner=False)
+def start_warmup(version):
+    """
+    Start the warm-up thread once per data version and process / 每个数据版本启动一次预热
+    Returns a status dict the UI can poll.
+    """
+    status = {"version": version, "done": [], "current": None, "error": None}
+    thread = threading.Thread(target=_run_warmup, args=(version, status),
+                              name=f"cache-warmup-{version}", daemon=True)
+    add_script_run_ctx(thread, get_script_run_ctx())
+    thread.start()
+    return status
+
+
+def _run_warmup(version, status):
+    try:
+        status["current"] = "clean data"
+        df_clean = artifacts.get_clean_data(version)
+        status["done"].append("clean data")
+        key = artifacts.view_key(version)
+        for name, build in WARMUP_STEPS:
+            status["current"] = name
+            build(key, df_clean)
+            status["done"].append(name)
+    except Exception as exc:  # 预热失败不影响页面，页面会按需计算 / pages fall back to on-demand
+        logger.exception("Cache warm-up failed for data version %s", version)
+        status["error"] = repr(exc)
+    finally:
+        status["current"] = None
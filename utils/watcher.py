@@ -0,0 +1,91 @@
+"""
+Data directory watcher / 数据文件监控
+
+A daemon thread polls the size and mtime of every input file (the CSV file
+or each partition of a dataset directory) and publishes the current data
+version in a shared status dict. Reruns read the version from there instead
+of stat-ing the data themselves. On a change the watcher invalidates only
+the stale artifacts, starts the warm-up for the new version, and open
+sessions show a refresh notice from a polling fragment.
+"""
+import logging
+import os
+import threading
+import time
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from utils.artifacts import invalidate_data
+from utils.io import DATA_PATH, data_version, file_versions
+from utils.warmup import start_warmup
+
+logger = logging.getLogger(__name__)
+
+WATCH_INTERVAL = float(os.environ.get("AUTO_SALES_WATCH_SECONDS", "2"))
+
+
+def diff_versions(old, new):
+    """
+    Added, removed and modified files between two scans / 两次扫描之间的文件变化
+    """
+    return {
+        "added": sorted(new.keys() - old.keys()),
+        "removed": sorted(old.keys() - new.keys()),
+        "modified": sorted(p for p in old.keys() & new.keys() if old[p] != new[p]),
+    }
+
+
+@st.cache_resource(show_spinner=False)
+def start_watcher(path=DATA_PATH, interval=WATCH_INTERVAL):
+    """
+    Scan once and start the polling thread, once per process / 每个进程启动一次监控
+    Returns the status dict: version, files, changes of the last update,
+    update count and the last scan error.
+    """
+    files = file_versions(path)
+    status = {"path": path, "version": data_version(path, files), "files": files,
+              "changes": None, "updates": 0, "error": None}
+    thread = threading.Thread(target=_watch, args=(status, interval), name="data-watcher", daemon=True)
+    add_script_run_ctx(thread, get_script_run_ctx())
+    thread.start()
+    return status
+
+
+@st.fragment(run_every=WATCH_INTERVAL)
+def refresh_notice(status, version):
+    """
+    Tell a session its data is out of date / 提示当前会话数据已更新
+    Reruns on its own every few seconds, so idle sessions also see the notice.
+    """
+    if status["version"] == version:
+        return
+    changes = status["changes"] or {}
+    n_files = sum(len(paths) for paths in changes.values())
+    if st.session_state.get("data_update_notified") != status["version"]:
+        st.session_state["data_update_notified"] = status["version"]
+        st.toast(f"Data updated ({n_files} file(s) changed)")
+    st.info(f"Data updated: {n_files} file(s) changed since this view was loaded.")
+    if st.button("Reload data", key="reload_data"):
+        st.rerun(scope="app")
+
+
+def _watch(status, interval):
+    while True:
+        time.sleep(interval)
+        try:
+            files = file_versions(status["path"])
+        except OSError as exc:  # 文件正在写入或被替换，下次再试 / file mid-write or replaced, retry next poll
+            status["error"] = repr(exc)
+            continue
+        status["error"] = None
+        if files == status["files"]:
+            continue
+
+        changes = diff_versions(status["files"], files)
+        old_version, version = status["version"], data_version(status["path"], files)
+        logger.info("Data changed (%s), version %s -> %s", changes, old_version, version)
+        invalidate_data(old_version, changes["removed"] + changes["modified"])
+        start_warmup.clear(old_version)
+        status.update(files=files, changes=changes, version=version, updates=status["updates"] + 1)
+        start_warmup(version)